@@ -0,0 +1,208 @@
+"""
+Admission control and load shedding for the validate endpoints.
+
+At most HAIVEN_MAX_CONCURRENT validations run at once. Further requests
+wait in a bounded queue for up to HAIVEN_ADMISSION_QUEUE_TIMEOUT_MS; when
+the queue is full, or the wait runs out, the request is shed at once (503
+with Retry-After) instead of piling up until everything times out together.
+
+Callers declare their class in the X-Haiven-Priority header: "interactive"
+(chat, the default) or "batch". Interactive requests are dequeued first,
+HAIVEN_INTERACTIVE_RESERVED slots are never given to batch work, and an
+interactive request arriving at a full queue takes the place of the newest
+queued batch request, which is shed.
+"""
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+
+PRIORITY_HEADER = "X-Haiven-Priority"
+INTERACTIVE = "interactive"
+BATCH = "batch"
+DEFAULT_PRIORITY = os.environ.get("HAIVEN_DEFAULT_PRIORITY", INTERACTIVE)
+
+MAX_CONCURRENT = int(os.environ.get("HAIVEN_MAX_CONCURRENT", "16"))
+MAX_QUEUE = int(os.environ.get("HAIVEN_MAX_QUEUE", "64"))
+QUEUE_TIMEOUT_MS = float(os.environ.get("HAIVEN_ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+INTERACTIVE_RESERVED = int(os.environ.get("HAIVEN_INTERACTIVE_RESERVED", str(max(1, MAX_CONCURRENT // 4))))
+
+# Weight of the newest service time in the average behind Retry-After
+_SERVICE_ALPHA = 0.1
+
+
+def parse_priority(value):
+    """Normalize a priority header (or message field) to interactive / batch."""
+    value = (value or DEFAULT_PRIORITY).strip().lower()
+    return BATCH if value == BATCH else INTERACTIVE
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed; reason is queue_full, queue_timeout or evicted."""
+
+    def __init__(self, reason, retry_after_s):
+        super().__init__(f"Validation service overloaded ({reason}), retry after {retry_after_s}s")
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class _Waiter:
+    __slots__ = ("priority", "granted", "evicted", "wake")
+
+    def __init__(self, priority, wake):
+        self.priority = priority
+        self.granted = False
+        self.evicted = False
+        self.wake = wake
+
+
+class AdmissionController:
+    def __init__(self, name, max_concurrent=MAX_CONCURRENT, max_queue=MAX_QUEUE,
+                 queue_timeout_ms=QUEUE_TIMEOUT_MS, interactive_reserved=INTERACTIVE_RESERVED):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_s = queue_timeout_ms / 1000.0
+        # Batch work never takes the last slots, but is never starved of all of them
+        self.batch_limit = max(1, self.max_concurrent - interactive_reserved)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queues = {INTERACTIVE: deque(), BATCH: deque()}
+        self._service_s = 0.05
+        self.admitted = {INTERACTIVE: 0, BATCH: 0}
+        self.shed = {INTERACTIVE: {}, BATCH: {}}
+        self.max_queue_depth = 0
+
+    def _has_slot(self, priority):
+        limit = self.max_concurrent if priority == INTERACTIVE else self.batch_limit
+        return self._in_flight < limit
+
+    def _queue_depth(self):
+        return len(self._queues[INTERACTIVE]) + len(self._queues[BATCH])
+
+    def retry_after_s(self):
+        """Whole seconds until the current backlog should have drained."""
+        backlog = self._queue_depth() + self._in_flight
+        return max(1, math.ceil(self._service_s * backlog / self.max_concurrent))
+
+    def _shed_locked(self, priority, reason):
+        counts = self.shed[priority]
+        counts[reason] = counts.get(reason, 0) + 1
+        return Overloaded(reason, self.retry_after_s())
+
+    def _enter(self, priority, wake):
+        """Admit now (None), queue (a waiter) or raise Overloaded. Caller holds no lock."""
+        with self._lock:
+            if self._has_slot(priority) and not self._queues[INTERACTIVE] and (
+                    priority == INTERACTIVE or not self._queues[BATCH]):
+                self._in_flight += 1
+                self.admitted[priority] += 1
+                return None
+            if self._queue_depth() >= self.max_queue:
+                if priority == INTERACTIVE and self._queues[BATCH]:
+                    # Newest batch waiter gives up its place
+                    evicted = self._queues[BATCH].pop()
+                    evicted.evicted = True
+                    evicted.wake()
+                else:
+                    raise self._shed_locked(priority, "queue_full")
+            waiter = _Waiter(priority, wake)
+            self._queues[priority].append(waiter)
+            self.max_queue_depth = max(self.max_queue_depth, self._queue_depth())
+            return waiter
+
+    def _settle(self, waiter):
+        """After a wait: admitted, or shed (and removed from the queue if still in it)."""
+        with self._lock:
+            if waiter.granted:
+                self.admitted[waiter.priority] += 1
+                return
+            if waiter.evicted:
+                raise self._shed_locked(waiter.priority, "evicted")
+            self._queues[waiter.priority].remove(waiter)
+            raise self._shed_locked(waiter.priority, "queue_timeout")
+
+    def _abandon(self, waiter):
+        """The caller stopped waiting (e.g. cancelled): leave the queue, or hand back a slot granted meanwhile."""
+        with self._lock:
+            if waiter.granted:
+                self._in_flight -= 1
+                self._grant_locked()
+            elif not waiter.evicted:
+                self._queues[waiter.priority].remove(waiter)
+
+    def _grant_locked(self):
+        for priority in (INTERACTIVE, BATCH):
+            queue = self._queues[priority]
+            while queue and self._has_slot(priority):
+                waiter = queue.popleft()
+                waiter.granted = True
+                self._in_flight += 1
+                waiter.wake()
+
+    def _release(self, service_s):
+        with self._lock:
+            self._in_flight -= 1
+            self._service_s += _SERVICE_ALPHA * (service_s - self._service_s)
+            self._grant_locked()
+
+    @contextmanager
+    def admit(self, priority=INTERACTIVE):
+        """Hold a slot for the duration of the block; raises Overloaded when shed."""
+        event = threading.Event()
+        waiter = self._enter(priority, event.set)
+        if waiter is not None:
+            try:
+                event.wait(self.queue_timeout_s)
+            except BaseException:
+                self._abandon(waiter)
+                raise
+            self._settle(waiter)
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started_at)
+
+    @asynccontextmanager
+    async def admit_async(self, priority=INTERACTIVE):
+        """Asyncio flavour of admit; waiting never blocks the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        waiter = self._enter(priority, wake)
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(future), self.queue_timeout_s)
+            except asyncio.TimeoutError:
+                pass
+            except BaseException:
+                # Cancelled while queued; a slot granted in the meantime must not leak
+                self._abandon(waiter)
+                raise
+            self._settle(waiter)
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(time.monotonic() - started_at)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "max_concurrent": self.max_concurrent,
+                "queue_depth": {priority: len(queue) for priority, queue in self._queues.items()},
+                "max_queue": self.max_queue,
+                "max_queue_depth_seen": self.max_queue_depth,
+                "admitted": dict(self.admitted),
+                "shed": {priority: dict(counts) for priority, counts in self.shed.items()},
+                "avg_service_ms": round(self._service_s * 1000, 2),
+            }
@@ -0,0 +1,77 @@
+"""
+Opportunistic micro-batching for validators that score many inputs per call.
+
+Callers on any thread submit one input and block for its result. A single
+worker thread takes whatever has queued up (up to max_batch) and scores it
+in one call, so concurrent requests share the fixed per-call cost while a
+lone request is scored immediately instead of waiting for company.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn, max_batch=64, max_wait_ms=0.0, name="batcher"):
+        """
+        batch_fn takes a list of inputs and returns a list of results in the
+        same order. With max_wait_ms > 0 a batch that is not yet full waits
+        up to that long for more inputs.
+        """
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.name = name
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.SimpleQueue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._start_lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._worker.start()
+
+    def submit(self, item, timeout=None):
+        """Score one input, batched with whatever else is in flight."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(timeout=timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    if self.max_wait_s:
+                        batch.append(self._queue.get(timeout=self.max_wait_s))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        futures = [future for _, future in batch]
+        try:
+            results = self.batch_fn([item for item, _ in batch])
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,271 @@
+"""
+Prebuilt validator bundle, produced at build time by setup.py.
+
+Instead of installing validators from the Guardrails hub at deploy time and
+resolving their code and data lazily on the first request, the build step
+writes one self-contained directory:
+
+    bundle/
+      manifest.json      format, build info, sha256 of every file below
+                         (checked at load, except for fingerprints/)
+      validators/<slug>/ hub validator code copied out of site-packages, one
+                         directory per hub URI (e.g. detect_pii/)
+      tables.json        expanded pattern sources (profanity word list merged)
+      toxicity.json      serialized toxicity model weights
+      fingerprints/      copy of the confidential document index, if any
+
+Workers open it at import time: hub validators are imported straight from
+the pinned copy (no guardrails.hub resolution), local validators take their
+tables and models from it, and warm_up() runs every validator once so the
+first real request does not pay for lazy model loads.
+
+HAIVEN_VALIDATOR_BUNDLE points at the bundle (default: bundle/ next to this
+file); set it to "off" to ignore any bundle and resolve everything at runtime.
+"""
+
+import hashlib
+import importlib
+import importlib.machinery
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+
+BUNDLE_FORMAT = 1
+DEFAULT_BUNDLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bundle")
+BUNDLE_DIR = os.environ.get("HAIVEN_VALIDATOR_BUNDLE", DEFAULT_BUNDLE_DIR)
+
+# Hub validators the serverless function uses: class name -> hub URI
+HUB_VALIDATORS = {
+    "DetectPII": "hub://guardrails/detect_pii",
+    "DetectSecrets": "hub://guardrails/detect_secrets",
+}
+
+# Bundle paths listed in the manifest but not hashed when a worker loads the bundle
+_UNVERIFIED_PREFIXES = ("fingerprints/",)
+
+WARM_UP_TEXT = "Warm-up request from Jane Doe <jane@example.com>, nothing to flag here."
+
+
+class BundleError(RuntimeError):
+    """Raised when a bundle is missing pieces or does not match its manifest."""
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bundle_files(root):
+    """Relative paths of every file under root except the manifest, sorted."""
+    files = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != "__pycache__")
+        for filename in filenames:
+            if filename.endswith((".pyc", ".pyo")):
+                continue
+            path = os.path.relpath(os.path.join(directory, filename), root)
+            if path != "manifest.json":
+                files.append(path.replace(os.sep, "/"))
+    return sorted(files)
+
+
+class Bundle:
+    def __init__(self, root):
+        self.root = root
+        manifest_path = os.path.join(root, "manifest.json")
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise BundleError(f"Unreadable bundle manifest {manifest_path}: {e}") from e
+        if self.manifest.get("format") != BUNDLE_FORMAT:
+            raise BundleError(f"Unsupported bundle format {self.manifest.get('format')!r}")
+        self._verify()
+        self.tables = self._load_json("tables.json")
+        self.toxicity = self._load_json("toxicity.json")
+        self.validators = self.manifest.get("validators", {})
+
+    def _verify(self):
+        # Only what gets executed or parsed at import time is hashed on cold
+        # start; the fingerprint index can be large, is mmapped on first use
+        # and checks its own segment headers
+        expected = self.manifest.get("files", {})
+        for path, digest in expected.items():
+            if path.startswith(_UNVERIFIED_PREFIXES):
+                continue
+            full_path = os.path.join(self.root, path)
+            if not os.path.isfile(full_path) or _sha256_file(full_path) != digest:
+                raise BundleError(f"Bundle file {path} is missing or does not match the manifest")
+
+    def _load_json(self, name):
+        path = os.path.join(self.root, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def path(self, name):
+        """Absolute path of a bundled file or directory, or None if not bundled."""
+        path = os.path.join(self.root, name)
+        return path if os.path.exists(path) else None
+
+    def load_validator(self, class_name):
+        """Import a hub validator class from its pinned copy in the bundle."""
+        entry = self.validators.get(class_name)
+        if entry is None:
+            raise BundleError(f"{class_name} is not in the bundle")
+        package_dir = os.path.join(self.root, "validators", entry["package"])
+        package_name = f"_haiven_bundle_{entry['package']}"
+        if package_name not in sys.modules:
+            init_path = os.path.join(package_dir, "__init__.py")
+            loader = importlib.machinery.SourceFileLoader(package_name, init_path)
+            spec = importlib.util.spec_from_file_location(
+                package_name, init_path, loader=loader, submodule_search_locations=[package_dir])
+            if spec is None:
+                raise BundleError(f"Bundled package {entry['package']} has no importable __init__.py")
+            package = importlib.util.module_from_spec(spec)
+            sys.modules[package_name] = package
+            loader.exec_module(package)
+        module_name = f"{package_name}.{entry['module']}" if entry.get("module") else package_name
+        return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_bundle(root=None):
+    """The bundle at root (default HAIVEN_VALIDATOR_BUNDLE), or None if there is none."""
+    root = root or BUNDLE_DIR
+    if not root or root == "off" or not os.path.exists(os.path.join(root, "manifest.json")):
+        return None
+    started_at = time.perf_counter()
+    try:
+        bundle = Bundle(root)
+    except BundleError as e:
+        print(f"[Bundle] Ignoring bundle at {root}: {e}")
+        return None
+    print(f"[Bundle] Loaded bundle built {bundle.manifest.get('built_at')} "
+          f"({len(bundle.validators)} hub validators) in {(time.perf_counter() - started_at) * 1000:.1f}ms")
+    return bundle
+
+
+def import_hub_validator(class_name, default_module="guardrails.hub"):
+    """A hub validator class from the bundle when one is loaded, else from default_module."""
+    if BUNDLE is not None and class_name in BUNDLE.validators:
+        try:
+            return BUNDLE.load_validator(class_name)
+        except Exception as e:
+            print(f"[Bundle] Could not load {class_name} from the bundle, resolving at runtime: {e}")
+    return getattr(importlib.import_module(default_module), class_name)
+
+
+def warm_up(validators, text=WARM_UP_TEXT):
+    """
+    Run each validator once so lazy imports, model loads and regex compiles
+    happen at startup. Calls bypass the scheduler so its costs stay clean.
+    Returns per-validator milliseconds.
+    """
+    timings = {}
+    for name, validator in validators.items():
+        started_at = time.perf_counter()
+        try:
+            validator(text)
+        except Exception as e:
+            print(f"[Bundle] Warm-up of {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - started_at) * 1000, 2)
+    print(f"[Bundle] Warmed up {len(timings)} validators: {timings}")
+    return timings
+
+
+def _vendor_validator(class_name, hub_uri, validators_dir):
+    """
+    Copy the installed package that defines class_name into validators_dir,
+    under the hub URI's slug (validators/detect_pii/): hub installs often name
+    every validator's package just "validator", so its own name is not unique.
+    """
+    from guardrails import hub  # type: ignore
+
+    cls = getattr(hub, class_name)
+    module = sys.modules[cls.__module__]
+    source_file = inspect.getfile(cls)
+    if os.path.basename(source_file) == "__init__.py":
+        package_dir, module_name = os.path.dirname(source_file), None
+    else:
+        package_dir, module_name = os.path.dirname(source_file), inspect.getmodulename(source_file)
+    if not os.path.exists(os.path.join(package_dir, "__init__.py")):
+        raise BundleError(f"{class_name} is not defined inside a package ({source_file})")
+
+    package = hub_uri.rstrip("/").rsplit("/", 1)[-1]
+    if not package.isidentifier():
+        raise BundleError(f"Cannot derive a package name for {class_name} from {hub_uri!r}")
+    if os.path.exists(os.path.join(validators_dir, package)):
+        raise BundleError(f"Two hub validators map to validators/{package}")
+    shutil.copytree(package_dir, os.path.join(validators_dir, package),
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pyc"))
+    return {
+        "package": package,
+        "source_package": os.path.basename(package_dir),
+        "module": module_name,
+        "source": module.__name__,
+        "version": getattr(module, "__version__", None),
+    }
+
+
+def build_bundle(out_dir, hub_validators=HUB_VALIDATORS):
+    """
+    Write a bundle to out_dir, replacing any previous one. Hub validators must
+    already be installed. Raises instead of skipping anything, so a broken
+    build fails the deploy rather than a request.
+    """
+    from _profanity import _load_words, matcher_pattern
+    from _toxicity import ToxicityModel
+    from _fingerprint import INDEX_PATH
+
+    staging = out_dir.rstrip("/\\") + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(os.path.join(staging, "validators"))
+
+    validators = {}
+    for class_name, hub_uri in hub_validators.items():
+        validators[class_name] = _vendor_validator(class_name, hub_uri, os.path.join(staging, "validators"))
+        print(f"[Bundle] Vendored {class_name} from {validators[class_name]['source']}")
+
+    with open(os.path.join(staging, "tables.json"), "w", encoding="utf-8") as f:
+        json.dump({"profanity": matcher_pattern(_load_words())}, f)
+
+    model = ToxicityModel.load()
+    with open(os.path.join(staging, "toxicity.json"), "w", encoding="utf-8") as f:
+        json.dump({"bias": model.bias, "weights": model.weights}, f)
+
+    if INDEX_PATH:
+        shutil.copytree(INDEX_PATH, os.path.join(staging, "fingerprints"))
+        print(f"[Bundle] Copied fingerprint index from {INDEX_PATH}")
+
+    try:
+        import guardrails  # type: ignore
+        guardrails_version = getattr(guardrails, "__version__", None)
+    except ImportError:
+        guardrails_version = None
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": ".".join(str(part) for part in sys.version_info[:3]),
+        "guardrails": guardrails_version,
+        "validators": validators,
+        "files": {path: _sha256_file(os.path.join(staging, path)) for path in _bundle_files(staging)},
+    }
+    with open(os.path.join(staging, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(staging, out_dir)
+    print(f"[Bundle] Wrote {len(manifest['files'])} files to {out_dir}")
+    return manifest
+
+
+BUNDLE = load_bundle()
@@ -0,0 +1,98 @@
+"""
+JSON codec and request-body helpers shared by the validation services.
+
+orjson is used when it is installed and the standard library otherwise.
+Both paths parse straight from the request byte buffer and encode straight
+to bytes, so no intermediate str copy of the payload is ever built.
+Set HAIVEN_JSON_CODEC=json to force the standard library codec.
+"""
+
+import json
+import os
+
+# Largest request body we are willing to allocate a buffer for
+MAX_BODY_BYTES = int(os.environ.get("HAIVEN_MAX_BODY_BYTES", str(1024 * 1024)))
+
+_REQUESTED_CODEC = os.environ.get("HAIVEN_JSON_CODEC", "orjson").lower()
+
+try:
+    if _REQUESTED_CODEC != "orjson":
+        raise ImportError(f"codec '{_REQUESTED_CODEC}' requested")
+    import orjson  # type: ignore
+
+    CODEC_NAME = "orjson"
+
+    def loads(buf):
+        """Parse JSON from bytes, bytearray or memoryview."""
+        return orjson.loads(buf)
+
+    def dumps(obj):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return orjson.dumps(obj)
+
+except ImportError:
+    CODEC_NAME = "json"
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def loads(buf):
+        """Parse JSON from bytes or bytearray."""
+        if isinstance(buf, memoryview):
+            buf = buf.tobytes()
+        # json.loads detects the encoding of bytes input itself
+        return json.loads(buf)
+
+    def dumps(obj):
+        """Serialize obj to UTF-8 JSON bytes."""
+        return _encoder.encode(obj).encode("utf-8")
+
+
+class PayloadTooLarge(ValueError):
+    """Raised when a request body exceeds MAX_BODY_BYTES."""
+
+    def __init__(self, size, limit=MAX_BODY_BYTES):
+        super().__init__(f"Request body of {size} bytes exceeds limit of {limit} bytes")
+        self.size = size
+        self.limit = limit
+
+
+def parse_content_length(value, limit=MAX_BODY_BYTES):
+    """
+    Validate a Content-Length header before any buffer is allocated.
+    Returns the length as an int (0 when missing or malformed).
+    """
+    try:
+        length = int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+    if length < 0:
+        return 0
+    if length > limit:
+        raise PayloadTooLarge(length, limit)
+    return length
+
+
+def read_body(stream, length):
+    """
+    Read exactly `length` bytes from a file-like stream into a single
+    preallocated buffer. Returns a bytearray, which both codecs parse
+    without another copy.
+    """
+    buf = bytearray(length)
+    view = memoryview(buf)
+    received = 0
+    while received < length:
+        n = stream.readinto(view[received:])
+        if not n:
+            break
+        received += n
+    view.release()
+    if received < length:
+        del buf[received:]
+    return buf
+
+
+def shape_response(result, include_original_text=True):
+    """Drop the echoed original_text from a result unless the caller wants it."""
+    if not include_original_text:
+        result.pop("original_text", None)
+    return result
@@ -0,0 +1,187 @@
+"""
+Deadline-aware execution of the Guardrails validators.
+
+The slow validator runs on a worker thread. If it has not answered by the
+time the caller's latency budget is nearly spent, it is abandoned and the
+regex fallback answers instead, with the result marked as degraded. A
+circuit breaker sends traffic straight to the fallback while the Guardrails
+path keeps timing out or failing.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+# Budget used when the caller does not send latency_budget_ms
+DEFAULT_BUDGET_MS = int(os.environ.get("HAIVEN_LATENCY_BUDGET_MS", "20000"))
+# Time kept back from the budget so the fallback can still answer in time
+FALLBACK_RESERVE_MS = int(os.environ.get("HAIVEN_FALLBACK_RESERVE_MS", "50"))
+GUARDRAILS_WORKERS = int(os.environ.get("HAIVEN_GUARDRAILS_WORKERS", "4"))
+
+_executor = ThreadPoolExecutor(max_workers=GUARDRAILS_WORKERS, thread_name_prefix="guardrails")
+
+
+class CircuitBreaker:
+    """
+    Classic closed / open / half-open breaker.
+
+    Opens after `failure_threshold` consecutive failures, stays open for
+    `reset_timeout` seconds, then lets a single probe through. A successful
+    probe closes it again; a failed one re-opens it.
+    """
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self.failure_threshold = failure_threshold or int(os.environ.get("HAIVEN_BREAKER_THRESHOLD", "5"))
+        self.reset_timeout = reset_timeout or float(os.environ.get("HAIVEN_BREAKER_RESET_S", "30"))
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self):
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+            self._probe_in_flight = False
+        return self._state
+
+    def acquire(self):
+        """"closed" or "probe" when a call may go ahead, None while the breaker is open."""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return "closed"
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return "probe"
+            return None
+
+    def allow_request(self):
+        return self.acquire() is not None
+
+    def release(self, permit):
+        """
+        End a call from acquire(). A probe that recorded neither success nor
+        failure (cancelled, or it never ran) frees the half-open slot, so the
+        next request can probe instead of the breaker staying shut for good.
+        """
+        if permit == "probe":
+            with self._lock:
+                if self._state == "half_open":
+                    self._probe_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    print(f"[Deadline] Circuit opened after {self._failures} consecutive failures")
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._probe_in_flight = False
+
+    def snapshot(self):
+        with self._lock:
+            return {"state": self._current_state(), "consecutive_failures": self._failures}
+
+
+def request_deadline(latency_budget_ms=None, started_at=None):
+    """Absolute monotonic deadline for a request that arrived at `started_at`."""
+    started_at = time.monotonic() if started_at is None else started_at
+    try:
+        budget_ms = float(latency_budget_ms) if latency_budget_ms is not None else DEFAULT_BUDGET_MS
+    except (TypeError, ValueError):
+        budget_ms = DEFAULT_BUDGET_MS
+    return started_at + max(budget_ms, 0) / 1000.0
+
+
+def _degrade(fallback, reason):
+    result = fallback()
+    result["degraded"] = True
+    result["degraded_reason"] = reason
+    return result
+
+
+def _time_left(deadline):
+    return deadline - time.monotonic() - FALLBACK_RESERVE_MS / 1000.0
+
+
+def validate_with_deadline(primary, fallback, deadline, breaker):
+    """
+    Run primary() on a worker thread and return its result if it finishes
+    before `deadline`; otherwise abandon it and return fallback() marked as
+    degraded. Both callables take no arguments and return a result dict.
+    """
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        # Not a Guardrails failure, so the breaker is left alone
+        return _degrade(fallback, "budget_exhausted")
+
+    permit = breaker.acquire()
+    if permit is None:
+        return _degrade(fallback, "circuit_open")
+    try:
+        future = _executor.submit(primary)
+        try:
+            result = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Threads cannot be killed; an abandoned call finishes in the background
+            future.cancel()
+            breaker.record_failure()
+            print("[Deadline] Guardrails exceeded the latency budget, using fallback")
+            return _degrade(fallback, "deadline_exceeded")
+        except Exception as e:
+            breaker.record_failure()
+            print(f"[Deadline] Guardrails failed, using fallback: {e}")
+            return _degrade(fallback, "validator_error")
+
+        breaker.record_success()
+    finally:
+        breaker.release(permit)
+    result.setdefault("degraded", False)
+    return result
+
+
+async def validate_with_deadline_async(primary, fallback, deadline, breaker):
+    """Asyncio flavour of validate_with_deadline for the FastAPI service."""
+    timeout = _time_left(deadline)
+    if timeout <= 0:
+        return _degrade(fallback, "budget_exhausted")
+
+    permit = breaker.acquire()
+    if permit is None:
+        return _degrade(fallback, "circuit_open")
+    try:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(_executor, primary)
+        try:
+            result = await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            breaker.record_failure()
+            print("[Deadline] Guardrails exceeded the latency budget, using fallback")
+            return _degrade(fallback, "deadline_exceeded")
+        except Exception as e:
+            breaker.record_failure()
+            print(f"[Deadline] Guardrails failed, using fallback: {e}")
+            return _degrade(fallback, "validator_error")
+
+        breaker.record_success()
+    finally:
+        # Also runs when the awaiting request is cancelled
+        breaker.release(permit)
+    result.setdefault("degraded", False)
+    return result
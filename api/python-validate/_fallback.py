@@ -0,0 +1,118 @@
+"""
+Regex fallback validation, used when Guardrails AI is unavailable, slow or unhealthy
+"""
+
+import re
+
+from _fingerprint import check_confidential_documents
+from _numeric_ids import check_numeric_identifiers
+from _profanity import check_profanity
+from _toxicity import check_toxicity
+
+PII_PATTERNS = [
+    (r'\b[A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,})?\b', "Personal name detected"),  # More specific name pattern (3+ chars each)
+    (r'\b\d{1,5}\s+[A-Za-z\s]+(?:street|st|avenue|ave|road|rd|drive|dr|lane|ln|terrace|way|place|pl|boulevard|blvd)\b', "Street address detected"),  # Address pattern
+    (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email address detected"),  # Email pattern
+    (r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b', "Phone number detected"),  # Phone pattern
+]
+
+# Skip common greeting words that aren't names
+COMMON_GREETINGS = [
+    "hello world", "good morning", "good afternoon", "good evening", "thank you",
+    "what is the weather", "how are you", "nice to meet", "see you later",
+    "have a good", "take care", "best regards", "kind regards"
+]
+
+SECRET_PATTERNS = [
+    (r'(?:api[_-]?key|secret[_-]?key|access[_-]?token)[\s:=]+[A-Za-z0-9+/]{20,}', "API key pattern detected"),  # API key pattern
+    (r'[A-Za-z0-9+/]{40,}={0,2}', "Base64 encoded secret pattern detected"),  # Base64 pattern
+]
+
+# Compiled once at import, not on the first request that needs them
+_PII_TABLE = [(re.compile(pattern, re.IGNORECASE), message) for pattern, message in PII_PATTERNS]
+_SECRET_TABLE = [(re.compile(pattern, re.IGNORECASE), message) for pattern, message in SECRET_PATTERNS]
+
+
+def check_pii_patterns(text):
+    text_lower = text.lower()
+    
+    # Don't flag common greetings as names
+    is_common_greeting = any(greeting in text_lower for greeting in COMMON_GREETINGS)
+    
+    for pattern, message in _PII_TABLE:
+        if pattern.search(text):
+            # Additional check for name pattern to avoid false positives
+            if "Personal name detected" in message and is_common_greeting:
+                print(f"[Fallback] Skipping name detection for common greeting")
+                continue
+                
+            print(f"[Fallback] PII pattern matched: {message}")
+            return [{
+                "type": "PII Detection",
+                "message": "Personal identifiable information detected",
+                "severity": "high"
+            }]  # Stop at first match
+    return []
+
+
+def check_financial_patterns(text):
+    # Cards, SSNs, IBANs and AU identifiers must pass their checksums, not just look numeric
+    violation = check_numeric_identifiers(text)
+    return [violation] if violation else []
+
+
+def check_secret_patterns(text):
+    for pattern, message in _SECRET_TABLE:
+        if pattern.search(text):
+            print(f"[Fallback] Secret pattern matched: {message}")
+            return [{
+                "type": "Code Secrets",
+                "message": "API keys or secrets detected",
+                "severity": "high"
+            }]
+    return []
+
+
+def as_list(check):
+    """Adapt a check returning one violation or None to the list-returning validator shape."""
+    def run(text):
+        violation = check(text)
+        return [violation] if violation else []
+    run.__name__ = check.__name__
+    return run
+
+
+# Validator name -> fn(text) returning a list of violations. Confidential
+# Documents, Toxic Language and Profanity Filter are local already, so they
+# run exactly as they do on the Guardrails path.
+FALLBACK_VALIDATORS = {
+    "PII Detection": check_pii_patterns,
+    "Financial & Medical Data": check_financial_patterns,
+    "API Keys & Secrets": check_secret_patterns,
+    "Confidential Documents": as_list(check_confidential_documents),
+    "Toxic Language": as_list(check_toxicity),
+    "Profanity Filter": as_list(check_profanity),
+}
+
+
+def validate_with_fallback_patterns(text, enabled_validators):
+    """
+    Fallback validation using regex patterns when Guardrails AI is not available.
+    Cheap enough that every enabled validator always runs.
+    """
+    print(f"[Fallback] Validating text with fallback patterns: {enabled_validators}")
+    
+    violations = []
+    for name, validator in FALLBACK_VALIDATORS.items():
+        if name in enabled_validators:
+            violations.extend(validator(text))
+    should_block = bool(violations)
+    
+    print(f"[Fallback] Validation complete. Should block: {should_block}, Violations: {len(violations)}")
+    
+    return {
+        "passed": not should_block,
+        "original_text": text,
+        "sanitized_text": None,
+        "violations": violations
+    }
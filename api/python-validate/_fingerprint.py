@@ -0,0 +1,337 @@
+"""
+Confidential document fingerprinting (winnowing over rolling k-gram hashes).
+
+Protected documents are normalized (lowercased, everything but letters and
+digits dropped), hashed as overlapping k-character grams with a Rabin-Karp
+rolling hash, and winnowed: only the minimum hash of every window of w
+consecutive grams is kept. Any shared run of at least k + w - 1 normalized
+characters is guaranteed to produce a common fingerprint, regardless of
+whitespace, punctuation or case changes.
+
+An index is a directory with a manifest and one or more immutable segment
+files. Each segment holds sorted uint64 fingerprints followed by the uint32
+id of the document each came from, and is opened with mmap so every worker
+on a machine shares one copy through the page cache. Adding documents
+writes a new segment; compact() merges segments when there are too many.
+At ~12 bytes per fingerprint, ten million fingerprints fit in ~120 MB.
+
+Build an index with scripts/build_fingerprint_index.py and point the
+services at it with HAIVEN_FINGERPRINT_INDEX, or ship a copy inside the
+prebuilt validator bundle.
+"""
+
+import array
+import bisect
+import fcntl
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from _bundle import BUNDLE
+
+INDEX_PATH = os.environ.get("HAIVEN_FINGERPRINT_INDEX") or (BUNDLE.path("fingerprints") if BUNDLE is not None else None)
+# A document only counts as leaked when this many of its fingerprints match
+MIN_MATCHES = int(os.environ.get("HAIVEN_FINGERPRINT_MIN_MATCHES", "3"))
+# Fingerprints shared by more documents than this are boilerplate and ignored
+MAX_DOC_FREQUENCY = int(os.environ.get("HAIVEN_FINGERPRINT_MAX_DOC_FREQ", "50"))
+# How often a loaded index checks its manifest for newly added segments
+RELOAD_INTERVAL_S = float(os.environ.get("HAIVEN_FINGERPRINT_RELOAD_S", "30"))
+
+DEFAULT_K = 50
+DEFAULT_W = 20
+
+_MOD = (1 << 61) - 1
+_BASE = 1000003
+_MAGIC = b"HVFP"
+_HEADER = struct.Struct("<4sIQ")
+_MANIFEST = "manifest.json"
+_LOCK = ".write.lock"
+
+CONFIDENTIAL_VIOLATION = {
+    "type": "Confidential Document",
+    "message": "Text from a protected internal document detected",
+    "severity": "high"
+}
+
+
+def normalize(text):
+    return "".join(ch for ch in text.lower() if ch.isalnum())
+
+
+def fingerprints(text, k=DEFAULT_K, w=DEFAULT_W):
+    """
+    Winnowed fingerprints of text as a set of ints. Runs in time linear in
+    len(text): one rolling-hash pass and one monotonic-deque window pass.
+    """
+    norm = normalize(text)
+    n = len(norm)
+    if n < k:
+        return set()
+
+    high = pow(_BASE, k - 1, _MOD)
+    codes = [ord(ch) for ch in norm]
+    h = 0
+    for c in codes[:k]:
+        h = (h * _BASE + c) % _MOD
+    hashes = [h]
+    for i in range(k, n):
+        h = ((h - codes[i - k] * high) * _BASE + codes[i]) % _MOD
+        hashes.append(h)
+
+    if len(hashes) <= w:
+        return {min(hashes)}
+
+    selected = set()
+    window = deque()  # indices with increasing hash values
+    for i, value in enumerate(hashes):
+        while window and hashes[window[-1]] >= value:
+            window.pop()
+        window.append(i)
+        if window[0] <= i - w:
+            window.popleft()
+        if i >= w - 1:
+            selected.add(hashes[window[0]])
+    return selected
+
+
+class _Segment:
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a fingerprint segment")
+        self.count = count
+        view = memoryview(self._mmap)
+        offset = _HEADER.size
+        self.hashes = view[offset:offset + 8 * count].cast("Q")
+        offset += 8 * count
+        self.doc_ids = view[offset:offset + 4 * count].cast("I")
+
+    def lookup(self, value):
+        """Document ids recorded for one fingerprint."""
+        i = bisect.bisect_left(self.hashes, value)
+        found = []
+        while i < self.count and self.hashes[i] == value:
+            found.append(self.doc_ids[i])
+            i += 1
+        return found
+
+    def entries(self):
+        for i in range(self.count):
+            yield self.hashes[i], self.doc_ids[i]
+
+    def close(self):
+        self.hashes.release()
+        self.doc_ids.release()
+        self._mmap.close()
+
+
+def _write_segment(path, entries):
+    """Write sorted (hash, doc_id) pairs as a segment file, atomically."""
+    hashes = array.array("Q")
+    doc_ids = array.array("I")
+    for value, doc_id in entries:
+        hashes.append(value)
+        doc_ids.append(doc_id)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, 1, len(hashes)))
+        hashes.tofile(f)
+        doc_ids.tofile(f)
+    os.replace(tmp_path, path)
+    return len(hashes)
+
+
+class FingerprintIndex:
+    """Read side of an index directory, safe to share between threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._segments = []
+        self._loaded_mtime = None
+        self._checked_at = 0.0
+        self.manifest = {}
+        self._load()
+
+    def _load(self, attempts=3):
+        manifest_path = os.path.join(self.path, _MANIFEST)
+        mtime = os.stat(manifest_path).st_mtime_ns
+        if mtime == self._loaded_mtime:
+            return
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get("byteorder", sys.byteorder) != sys.byteorder:
+            raise ValueError(f"Fingerprint index {self.path} was built on a {manifest['byteorder']}-endian machine")
+        loaded = {segment.path: segment for segment in self._segments}
+        segments = []
+        try:
+            for name in manifest["segments"]:
+                seg_path = os.path.join(self.path, name)
+                segments.append(loaded.get(seg_path) or _Segment(seg_path))
+        except FileNotFoundError:
+            # A compaction swapped the manifest and removed this segment since we read it
+            if attempts <= 1:
+                raise
+            return self._load(attempts - 1)
+        self._segments = segments
+        self.manifest = manifest
+        self._loaded_mtime = mtime
+        # Segments dropped by a compaction are unmapped once in-flight lookups let go of them
+
+    def refresh(self):
+        """Pick up segments added since the index was opened (rate limited)."""
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL_S:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                self._load()
+            except OSError as e:
+                print(f"[Fingerprint] Could not reload index: {e}")
+
+    @property
+    def size(self):
+        return sum(segment.count for segment in self._segments)
+
+    def match(self, text):
+        """
+        Map of document name -> matching fingerprint count for documents with
+        at least MIN_MATCHES fingerprints in common with text.
+        """
+        self.refresh()
+        segments = self._segments
+        k = self.manifest.get("k", DEFAULT_K)
+        w = self.manifest.get("w", DEFAULT_W)
+        hits = {}
+        for value in fingerprints(text, k, w):
+            doc_ids = []
+            for segment in segments:
+                doc_ids.extend(segment.lookup(value))
+            if len(doc_ids) > MAX_DOC_FREQUENCY:
+                continue
+            for doc_id in set(doc_ids):
+                hits[doc_id] = hits.get(doc_id, 0) + 1
+        documents = self.manifest.get("documents", [])
+        return {
+            documents[doc_id] if doc_id < len(documents) else str(doc_id): count
+            for doc_id, count in hits.items()
+            if count >= MIN_MATCHES
+        }
+
+
+@contextmanager
+def _writer_lock(path):
+    """Exclusive lock serializing add_documents and compact on one index directory."""
+    with open(os.path.join(path, _LOCK), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _read_manifest(path, k=DEFAULT_K, w=DEFAULT_W):
+    manifest_path = os.path.join(path, _MANIFEST)
+    if not os.path.exists(manifest_path):
+        return {"version": 1, "k": k, "w": w, "byteorder": sys.byteorder, "segments": [], "documents": [], "next_segment": 0}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def add_documents(path, documents, k=DEFAULT_K, w=DEFAULT_W):
+    """
+    Add (name, text) pairs to the index at path, creating it if needed.
+    Writes one new segment; existing segments are never rewritten.
+    Returns the number of fingerprints added.
+    """
+    os.makedirs(path, exist_ok=True)
+    with _writer_lock(path):
+        manifest = _read_manifest(path, k, w)
+        entries = []
+        for name, text in documents:
+            doc_id = len(manifest["documents"])
+            manifest["documents"].append(name)
+            entries.extend((value, doc_id) for value in fingerprints(text, manifest["k"], manifest["w"]))
+        if not entries:
+            return 0
+        entries.sort()
+
+        segment_name = f"segment-{manifest['next_segment']:06d}.bin"
+        added = _write_segment(os.path.join(path, segment_name), entries)
+        manifest["segments"].append(segment_name)
+        manifest["next_segment"] += 1
+        _write_manifest(path, manifest)
+    return added
+
+
+def compact(path):
+    """
+    Merge all segments of an index into one. Holds the writer lock
+    throughout, so segments added meanwhile wait and are never dropped.
+    Readers switch over on reload.
+    """
+    with _writer_lock(path):
+        manifest = _read_manifest(path)
+        if len(manifest["segments"]) <= 1:
+            return
+        segments = [_Segment(os.path.join(path, name)) for name in manifest["segments"]]
+        segment_name = f"segment-{manifest['next_segment']:06d}.bin"
+        try:
+            _write_segment(os.path.join(path, segment_name), heapq.merge(*(segment.entries() for segment in segments)))
+        finally:
+            for segment in segments:
+                segment.close()
+        old_segments = manifest["segments"]
+        manifest["segments"] = [segment_name]
+        manifest["next_segment"] += 1
+        _write_manifest(path, manifest)
+        # Open readers keep their mmaps valid after unlink on POSIX; readers
+        # still holding the old manifest retry their load
+        for name in old_segments:
+            os.remove(os.path.join(path, name))
+
+
+def _write_manifest(path, manifest):
+    tmp_path = os.path.join(path, _MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(path, _MANIFEST))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """Process-wide index opened from HAIVEN_FINGERPRINT_INDEX, or None."""
+    global _index
+    if _index is None and INDEX_PATH:
+        with _index_lock:
+            if _index is None:
+                _index = FingerprintIndex(INDEX_PATH)
+                print(f"[Fingerprint] Loaded {_index.size} fingerprints from {INDEX_PATH}")
+    return _index
+
+
+def check_confidential_documents(text):
+    """Violation dict when text reproduces a protected document, else None."""
+    index = get_index()
+    if index is None:
+        print("[Fingerprint] No fingerprint index configured (HAIVEN_FINGERPRINT_INDEX)")
+        return None
+    matches = index.match(text)
+    if not matches:
+        return None
+    print(f"[Fingerprint] Matched protected documents: {matches}")
+    return dict(CONFIDENTIAL_VIOLATION)
@@ -0,0 +1,340 @@
+"""
+Shared asyncio client for the HTTP inference endpoint (HAIVEN_INFERENCE_URL).
+
+Instead of one urllib request (and one TCP connection) per validator call:
+
+- connections to each endpoint are kept alive and reused from a pool
+- concurrent detect() calls arriving within HAIVEN_INFERENCE_BATCH_WINDOW_MS
+  are sent as one batched request (the endpoint takes a list of inputs)
+- at most HAIVEN_INFERENCE_MAX_CONCURRENCY requests are in flight per endpoint;
+  further batches wait for a slot instead of opening more connections
+- connection errors, 429 and 5xx answers are retried up to
+  HAIVEN_INFERENCE_RETRIES times with full-jitter backoff, within the timeout
+
+post_json() sends one unbatched request through the same pool, cap and
+retries, for endpoints with their own request format: the Guardrails hub
+validators' remote inference goes through it (see _remote.pooled_hub_validator).
+
+The client owns an event loop on a background thread, so the synchronous
+validators (which run on worker threads) call detect() and block, while
+asyncio code awaits detect_async().
+"""
+
+import asyncio
+import json
+import os
+import random
+import socket
+import ssl
+import threading
+import time
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Optional
+from urllib.parse import urlsplit
+
+MAX_CONCURRENCY = int(os.environ.get("HAIVEN_INFERENCE_MAX_CONCURRENCY", "8"))
+BATCH_WINDOW_MS = float(os.environ.get("HAIVEN_INFERENCE_BATCH_WINDOW_MS", "2"))
+MAX_BATCH = int(os.environ.get("HAIVEN_INFERENCE_MAX_BATCH", "32"))
+RETRIES = int(os.environ.get("HAIVEN_INFERENCE_RETRIES", "2"))
+RETRY_BASE_MS = float(os.environ.get("HAIVEN_INFERENCE_RETRY_BASE_MS", "50"))
+RETRY_CAP_MS = float(os.environ.get("HAIVEN_INFERENCE_RETRY_CAP_MS", "1000"))
+# Pooled connections idle for longer are closed rather than reused
+IDLE_TIMEOUT_S = float(os.environ.get("HAIVEN_INFERENCE_IDLE_TIMEOUT_S", "30"))
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Pooled connections found dead on use that may be swapped for another before an attempt fails
+_STALE_CONNECTION_RETRIES = 2
+
+# Per-thread CPU clocks exist on Linux but not on every platform
+_thread_cpu_clock = getattr(time, "pthread_getcpuclockid", None)
+
+
+class InferenceError(RuntimeError):
+    """Raised when the inference endpoint fails or answers with garbage."""
+
+
+class _RetryableError(InferenceError):
+    pass
+
+
+class _Endpoint:
+    """Pool, concurrency cap, pending batch and counters for one URL."""
+
+    def __init__(self, url, max_concurrency):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise InferenceError(f"Unsupported inference URL: {url}")
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.host_header = parts.netloc
+        self.slots = asyncio.Semaphore(max(1, max_concurrency))
+        self.idle = deque()  # (reader, writer, last_used)
+        self.pending = []  # (input, future)
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.stats = {"requests": 0, "batches": 0, "items": 0, "max_batch": 0, "retries": 0,
+                      "failures": 0, "connections_opened": 0, "in_flight": 0}
+
+    async def connection(self):
+        """A pooled connection if a fresh one is idle, else a new one; (reader, writer, reused)."""
+        while self.idle:
+            reader, writer, last_used = self.idle.pop()
+            if time.monotonic() - last_used < IDLE_TIMEOUT_S and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stats["connections_opened"] += 1
+        return reader, writer, False
+
+    def release(self, reader, writer):
+        self.idle.append((reader, writer, time.monotonic()))
+
+
+async def _read_body(reader, headers):
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"]))
+    return await reader.read()
+
+
+async def _post(endpoint, body, headers=None):
+    """One HTTP/1.1 POST over a pooled connection; returns (status, body bytes)."""
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    request = (
+        f"POST {endpoint.path} HTTP/1.1\r\nHost: {endpoint.host_header}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n{extra}"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode("latin-1") + body
+    stale_retries = 0
+    while True:
+        try:
+            reader, writer, reused = await endpoint.connection()
+        except OSError as e:
+            raise _RetryableError(f"Inference endpoint unreachable: {e}") from e
+        try:
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed by the inference endpoint")
+            version, status = status_line.split(b" ", 2)[:2]
+            response_headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+            payload = await _read_body(reader, response_headers)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            writer.close()
+            if reused and stale_retries < _STALE_CONNECTION_RETRIES:
+                # The server dropped an idle keep-alive connection; not a failed attempt
+                stale_retries += 1
+                continue
+            raise _RetryableError(f"Inference endpoint unreachable: {e}") from e
+        except BaseException:
+            writer.close()
+            raise
+        break
+
+    framed = "content-length" in response_headers or response_headers.get("transfer-encoding", "").lower() == "chunked"
+    if framed and version != b"HTTP/1.0" and response_headers.get("connection", "").lower() != "close":
+        endpoint.release(reader, writer)
+    else:
+        writer.close()
+    return int(status), payload
+
+
+class InferenceClient:
+    def __init__(self, max_concurrency=MAX_CONCURRENCY, batch_window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH,
+                 retries=RETRIES, retry_base_ms=RETRY_BASE_MS, retry_cap_ms=RETRY_CAP_MS):
+        self.max_concurrency = max_concurrency
+        self.batch_window_s = batch_window_ms / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.retries = max(0, retries)
+        self.retry_base_s = retry_base_ms / 1000.0
+        self.retry_cap_s = retry_cap_ms / 1000.0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._endpoints = {}
+
+    def _running_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name="inference-client", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _endpoint(self, url):
+        endpoint = self._endpoints.get(url)
+        if endpoint is None:
+            endpoint = self._endpoints[url] = _Endpoint(url, self.max_concurrency)
+        return endpoint
+
+    def detect(self, url, text, entities, timeout):
+        """Entities found in text; blocks the calling (non-loop) thread."""
+        future = asyncio.run_coroutine_threadsafe(self._detect(url, text, entities, timeout), self._running_loop())
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise InferenceError(f"Inference endpoint timed out after {timeout}s") from e
+
+    async def detect_async(self, url, text, entities, timeout):
+        """Same as detect(), awaitable from any event loop."""
+        future = asyncio.run_coroutine_threadsafe(self._detect(url, text, entities, timeout), self._running_loop())
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError as e:
+            raise InferenceError(f"Inference endpoint timed out after {timeout}s") from e
+
+    def post_json(self, url, payload, timeout, headers=None):
+        """
+        One unbatched JSON POST through the same pool, concurrency cap and
+        retries, for endpoints with their own request format (e.g. the
+        Guardrails hub's remote inference). Returns the decoded response.
+        """
+        future = asyncio.run_coroutine_threadsafe(self._post_json(url, payload, timeout, headers),
+                                                  self._running_loop())
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise InferenceError(f"Inference endpoint timed out after {timeout}s") from e
+
+    async def _post_json(self, url, payload, timeout, headers):
+        endpoint = self._endpoint(url)
+        body = json.dumps(payload).encode("utf-8")
+        try:
+            return await self._post_with_retries(endpoint, body, 1, time.monotonic() + timeout, _parse_json, headers)
+        except Exception:
+            endpoint.stats["failures"] += 1
+            raise
+
+    async def _detect(self, url, text, entities, timeout):
+        endpoint = self._endpoint(url)
+        future = asyncio.get_running_loop().create_future()
+        endpoint.pending.append(({"text": text, "entities": entities}, future))
+        if len(endpoint.pending) >= self.max_batch:
+            self._flush(endpoint, timeout)
+        elif endpoint.flush_handle is None:
+            endpoint.flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_window_s, self._flush, endpoint, timeout)
+        return await future
+
+    def _flush(self, endpoint, timeout):
+        if endpoint.flush_handle is not None:
+            endpoint.flush_handle.cancel()
+            endpoint.flush_handle = None
+        batch, endpoint.pending = endpoint.pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._send(endpoint, batch, timeout))
+
+    async def _send(self, endpoint, batch, timeout):
+        deadline = time.monotonic() + timeout
+        body = json.dumps({"inputs": [item for item, _ in batch]}).encode("utf-8")
+        try:
+            results = await self._post_with_retries(
+                endpoint, body, len(batch), deadline, lambda status, payload: _parse_results(status, payload, len(batch)))
+        except Exception as e:
+            endpoint.stats["failures"] += 1
+            error = e if isinstance(e, InferenceError) else InferenceError(str(e))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _post_with_retries(self, endpoint, body, size, deadline, parse, headers=None):
+        async with endpoint.slots:
+            stats = endpoint.stats
+            stats["batches"] += 1
+            stats["items"] += size
+            stats["max_batch"] = max(stats["max_batch"], size)
+            stats["in_flight"] += 1
+            try:
+                for attempt in range(self.retries + 1):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise InferenceError("Inference endpoint timed out")
+                    stats["requests"] += 1
+                    try:
+                        status, payload = await asyncio.wait_for(_post(endpoint, body, headers), remaining)
+                        return parse(status, payload)
+                    except asyncio.TimeoutError as e:
+                        raise InferenceError("Inference endpoint timed out") from e
+                    except _RetryableError:
+                        # Full jitter: a random wait up to the exponential step, so retries spread out
+                        backoff = random.uniform(0, min(self.retry_cap_s, self.retry_base_s * 2 ** attempt))
+                        if attempt == self.retries or time.monotonic() + backoff >= deadline:
+                            raise
+                        stats["retries"] += 1
+                        await asyncio.sleep(backoff)
+                raise InferenceError("Inference endpoint retries exhausted")
+            finally:
+                stats["in_flight"] -= 1
+
+    def cpu_time(self):
+        """CPU seconds used so far by the client's event loop thread (0 where not measurable)."""
+        thread = self._thread
+        if _thread_cpu_clock is None or thread is None or thread.ident is None:
+            return 0.0
+        try:
+            return time.clock_gettime(_thread_cpu_clock(thread.ident))
+        except OSError:
+            return 0.0
+
+    def snapshot(self):
+        return {
+            url: dict(endpoint.stats, idle_connections=len(endpoint.idle))
+            for url, endpoint in list(self._endpoints.items())
+        }
+
+
+def _check_status(status):
+    if status in _RETRY_STATUSES:
+        raise _RetryableError(f"Inference endpoint returned {status}")
+    if status != 200:
+        raise InferenceError(f"Inference endpoint returned {status}")
+
+
+def _parse_json(status, payload):
+    _check_status(status)
+    try:
+        return json.loads(payload)
+    except ValueError as e:
+        raise InferenceError(f"Malformed inference response: {e}") from e
+
+
+def _parse_results(status, payload, size):
+    _check_status(status)
+    try:
+        results = [result["entities"] for result in json.loads(payload)["results"]]
+    except (ValueError, KeyError, TypeError) as e:
+        raise InferenceError(f"Malformed inference response: {e}") from e
+    if len(results) != size:
+        raise InferenceError(f"Malformed inference response: {len(results)} results for {size} inputs")
+    return results
+
+
+INFERENCE_CLIENT = InferenceClient()
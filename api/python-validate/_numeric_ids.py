@@ -0,0 +1,466 @@
+"""
+Checksum-verified detection of numeric identifiers: payment cards (Luhn plus
+issuer prefix), US SSNs (SSA area/group/serial rules), IBANs (mod 97) and the
+Australian ABN, ACN, TFN and Medicare numbers that scripts/validate_*.py ask
+DetectPII for.
+
+Matching "any 9 or 16 digits" blocks order numbers, timestamps and IDs, so
+candidates are extracted in one pass and each must pass its checksum:
+
+- Grouped numbers ("4111 1111 1111 1111", "123-45-6789", "51 824 753 556")
+  must use the identifier's printed grouping.
+- Bare digit runs count as cards when they pass Luhn and carry an issuer
+  prefix. The shorter AU/SSN formats, whose checksums pass about one random
+  number in ten, also need a keyword such as "tfn" or "ssn" shortly before.
+
+Random 16-digit numbers still pass as cards about one time in fifty. That
+is the floor for any checksum-only check.
+
+With numpy the text is scanned as a byte array. Bare runs of each length,
+and grouped numbers laid out exactly like a printed format, are verified
+together as one digit matrix. Without numpy a regex tokenizer does the same
+work about eight times slower. Run scripts/bench_numeric_ids.py for
+throughput and false positives.
+"""
+
+import re
+
+try:
+    import numpy as np  # type: ignore
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+CREDIT_CARD = "CREDIT_CARD"
+US_SSN = "US_SSN"
+IBAN_CODE = "IBAN_CODE"
+AU_ABN = "AU_ABN"
+AU_ACN = "AU_ACN"
+AU_TFN = "AU_TFN"
+AU_MEDICARE = "AU_MEDICARE"
+
+NUMERIC_ID_VIOLATION = {
+    "type": "Sensitive Data",
+    "message": "Sensitive financial or medical information detected",
+    "severity": "high"
+}
+
+MIN_DIGITS = 8
+MAX_DIGITS = 19
+# Bytes before a bare number searched for a context keyword
+CONTEXT_WINDOW = 48
+
+CONTEXT_KEYWORDS = {
+    US_SSN: (b"ssn", b"social security"),
+    AU_TFN: (b"tfn", b"tax file"),
+    AU_ACN: (b"acn", b"company number"),
+    AU_ABN: (b"abn", b"business number"),
+    AU_MEDICARE: (b"medicare",),
+}
+
+# Printed groupings (digits per group) that identify a number without any context
+GROUPED_FORMATS = {
+    (3, 2, 4): (US_SSN,),
+    (3, 3, 3): (AU_TFN, AU_ACN),
+    (3, 3, 2): (AU_TFN,),
+    (2, 3, 3, 3): (AU_ABN,),
+    (4, 5, 1): (AU_MEDICARE,),
+    (4, 5, 1, 1): (AU_MEDICARE,),
+    # Amex and Diners
+    (4, 6, 5): (CREDIT_CARD,),
+    (4, 6, 4): (CREDIT_CARD,),
+}
+# Other cards: groups of four, the last one possibly shorter
+for _full in (3, 4):
+    for _last in range(1, 5):
+        if _full * 4 + _last <= 19:
+            GROUPED_FORMATS[(4,) * _full + (_last,)] = (CREDIT_CARD,)
+
+IBAN_LENGTHS = {
+    "AD": 24, "AE": 23, "AT": 20, "BE": 16, "BG": 22, "BH": 22, "BR": 29, "CH": 21, "CY": 28,
+    "CZ": 24, "DE": 22, "DK": 18, "EE": 20, "ES": 24, "FI": 18, "FR": 27, "GB": 22, "GI": 23,
+    "GR": 27, "HR": 21, "HU": 28, "IE": 22, "IL": 23, "IS": 26, "IT": 27, "KW": 30, "KZ": 20,
+    "LB": 28, "LI": 21, "LT": 20, "LU": 20, "LV": 21, "MC": 27, "MT": 31, "NL": 18, "NO": 15,
+    "PK": 24, "PL": 28, "PT": 25, "QA": 29, "RO": 24, "RS": 22, "SA": 24, "SE": 24, "SI": 19,
+    "SK": 24, "SM": 27, "TN": 24, "TR": 26, "UA": 29,
+}
+
+# Published example / advertising SSNs that pass the structural rules
+_INVALID_SSNS = {"078051120", "219099999"} | {f"98765432{i}" for i in range(10)}
+
+_ABN_WEIGHTS = (10, 1, 3, 5, 7, 9, 11, 13, 15, 17, 19)
+_ACN_WEIGHTS = (8, 7, 6, 5, 4, 3, 2, 1)
+_TFN_WEIGHTS = {8: (10, 7, 8, 4, 6, 3, 5, 1), 9: (1, 4, 3, 7, 5, 8, 6, 9, 10)}
+_MEDICARE_WEIGHTS = (1, 3, 7, 9, 1, 3, 7, 9)
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+# A number of at least MIN_DIGITS digits, groups joined by single spaces or hyphens
+_NUMBER = re.compile(rb"\d(?:[ -]?\d){%d,}" % (MIN_DIGITS - 1))
+_WORD = frozenset(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_")
+_GROUP_SPLIT = re.compile(rb"[ -]")
+_IBAN = re.compile(rb"(?<![A-Za-z0-9])[A-Z]{2}\d{2}(?: ?[A-Z0-9]){11,32}")
+
+
+# Checksums on digit strings (pure Python; the numpy path mirrors them)
+
+def luhn_valid(digits):
+    total = 0
+    for i, ch in enumerate(reversed(digits)):
+        d = ord(ch) - 48
+        total += _LUHN_DOUBLED[d] if i & 1 else d
+    return total % 10 == 0
+
+
+def card_prefix_valid(p2, p3, p4, length):
+    """Issuer (IIN) prefix check; works on ints or numpy arrays of prefixes."""
+    ok = (p2 // 10 == 4) & (length in (13, 16, 19))  # Visa
+    if length == 16:
+        ok = ok | ((p2 >= 51) & (p2 <= 55)) | ((p4 >= 2221) & (p4 <= 2720))  # Mastercard
+    if length == 15:
+        ok = ok | (p2 == 34) | (p2 == 37)  # Amex
+    if length >= 14:
+        ok = ok | (p2 == 36) | (p2 == 38) | (p2 == 39) | ((p3 >= 300) & (p3 <= 305))  # Diners
+    if length >= 16:
+        ok = (ok | (p4 == 6011) | (p2 == 65) | ((p3 >= 644) & (p3 <= 649))  # Discover
+              | ((p4 >= 3528) & (p4 <= 3589))  # JCB
+              | (p2 == 62))  # UnionPay
+    return ok
+
+
+def card_valid(digits):
+    length = len(digits)
+    if not 13 <= length <= MAX_DIGITS:
+        return False
+    return bool(card_prefix_valid(int(digits[:2]), int(digits[:3]), int(digits[:4]), length)) and luhn_valid(digits)
+
+
+def ssn_valid(digits):
+    if len(digits) != 9 or digits in _INVALID_SSNS:
+        return False
+    area, group, serial = int(digits[:3]), int(digits[3:5]), int(digits[5:])
+    return 0 < area < 900 and area != 666 and group != 0 and serial != 0
+
+
+def _weighted(digits, weights):
+    return sum((ord(ch) - 48) * w for ch, w in zip(digits, weights))
+
+
+def abn_valid(digits):
+    if len(digits) != 11 or digits[0] == "0":
+        return False
+    return (_weighted(digits, _ABN_WEIGHTS) - _ABN_WEIGHTS[0]) % 89 == 0
+
+
+def acn_valid(digits):
+    if len(digits) != 9:
+        return False
+    return (10 - _weighted(digits, _ACN_WEIGHTS) % 10) % 10 == ord(digits[8]) - 48
+
+
+def tfn_valid(digits):
+    weights = _TFN_WEIGHTS.get(len(digits))
+    return weights is not None and _weighted(digits, weights) % 11 == 0
+
+
+def medicare_valid(digits):
+    if len(digits) not in (10, 11) or digits[0] not in "23456":
+        return False
+    return _weighted(digits, _MEDICARE_WEIGHTS) % 10 == ord(digits[8]) - 48
+
+
+def iban_valid(iban):
+    iban = iban.replace(" ", "")
+    if IBAN_LENGTHS.get(iban[:2]) != len(iban):
+        return False
+    rearranged = iban[4:] + iban[:4]
+    return int("".join(str(int(ch, 36)) for ch in rearranged)) % 97 == 1
+
+
+_VALIDATORS = {
+    CREDIT_CARD: card_valid,
+    US_SSN: ssn_valid,
+    AU_TFN: tfn_valid,
+    AU_ACN: acn_valid,
+    AU_ABN: abn_valid,
+    AU_MEDICARE: medicare_valid,
+}
+
+# Bare run length -> entities that need a context keyword to count
+_CONTEXT_ENTITIES = {
+    8: (AU_TFN,),
+    9: (US_SSN, AU_TFN, AU_ACN),
+    10: (AU_MEDICARE,),
+    11: (AU_ABN, AU_MEDICARE),
+}
+
+
+def _has_context(data, start, entity):
+    window = data[max(0, start - CONTEXT_WINDOW):start].lower()
+    return any(keyword in window for keyword in CONTEXT_KEYWORDS[entity])
+
+
+def _classify_run(digits, data, start):
+    """Entities a bare digit run could be, verified."""
+    length = len(digits)
+    if length >= 13:
+        return [(CREDIT_CARD, digits)] if card_valid(digits) else []
+    return [
+        (entity, digits) for entity in _CONTEXT_ENTITIES.get(length, ())
+        if _has_context(data, start, entity) and _VALIDATORS[entity](digits)
+    ]
+
+
+def _classify_grouped(token, data, start):
+    """Entities found in a separated number, trying each run of whole groups."""
+    groups = [group.decode("ascii") for group in _GROUP_SPLIT.split(token)]
+    lengths = [len(group) for group in groups]
+    found = []
+    for i in range(len(groups)):
+        if lengths[i] >= MIN_DIGITS:
+            found.extend(_classify_run(groups[i], data, start))
+        total = lengths[i]
+        for j in range(i + 1, len(groups)):
+            total += lengths[j]
+            if total > MAX_DIGITS:
+                break
+            entities = GROUPED_FORMATS.get(tuple(lengths[i:j + 1]))
+            if entities:
+                digits = "".join(groups[i:j + 1])
+                found.extend((entity, digits) for entity in entities if _VALIDATORS[entity](digits))
+    return found
+
+
+def _scan_ibans(data, matches=None):
+    found = []
+    for match in matches if matches is not None else _IBAN.finditer(data):
+        compact = match.group().replace(b" ", b"").decode("ascii")
+        length = IBAN_LENGTHS.get(compact[:2])
+        if length and len(compact) >= length and iban_valid(compact[:length]):
+            found.append((IBAN_CODE, compact[:length]))
+    return found
+
+
+def _free_standing(data, start, end):
+    """A number not glued to a word and not part of a decimal."""
+    if start > 0 and (data[start - 1] in _WORD or data[start - 1] == 46):
+        return False
+    if end < len(data) and (data[end] in _WORD or (data[end] == 46 and data[end + 1:end + 2].isdigit())):
+        return False
+    return True
+
+
+def _scan_python(data):
+    found = []
+    for match in _NUMBER.finditer(data):
+        token = match.group()
+        if not _free_standing(data, match.start(), match.end()):
+            continue
+        if token.isdigit():
+            if len(token) <= MAX_DIGITS:
+                found.extend(_classify_run(token.decode("ascii"), data, match.start()))
+        else:
+            found.extend(_classify_grouped(token, data, match.start()))
+    return found
+
+
+if NUMPY_AVAILABLE:
+    _WORD_BYTE = np.zeros(256, dtype=bool)
+    _WORD_BYTE[list(_WORD)] = True
+    _LUHN_TABLE = np.array(_LUHN_DOUBLED, dtype=np.int32)
+
+    def _has_sub_format(lengths):
+        return any(
+            tuple(lengths[i:j]) in GROUPED_FORMATS
+            for i in range(len(lengths)) for j in range(i + 2, len(lengths) + 1)
+            if (i, j) != (0, len(lengths))
+        )
+
+    # Byte length -> [(bitmask of separator positions, digit columns, entities)].
+    # Formats containing another format are left to _classify_grouped.
+    _TEMPLATES = {}
+    for _lengths, _entities in GROUPED_FORMATS.items():
+        if _has_sub_format(_lengths):
+            continue
+        _columns, _position = [], 0
+        for _n in _lengths:
+            _columns.extend(range(_position, _position + _n))
+            _position += _n + 1
+        _size = _position - 1
+        _mask = sum(1 << p for p in range(_size) if p not in _columns)
+        _TEMPLATES.setdefault(_size, []).append((_mask, np.array(_columns), _entities))
+
+    def _tokens_numpy(buf):
+        """Start/end offsets and digit counts of every number in the buffer."""
+        digit = (buf - 48) < 10  # uint8 wraps, so only b"0".."9" are < 10
+        joinable = np.zeros(len(buf), dtype=bool)
+        joinable[1:-1] = ((buf[1:-1] == 32) | (buf[1:-1] == 45)) & digit[:-2] & digit[2:]
+        in_token = np.zeros(len(buf) + 2, dtype=bool)
+        np.logical_or(digit, joinable, out=in_token[1:-1])
+        edges = np.flatnonzero(in_token[1:] != in_token[:-1])
+        starts, ends = edges[0::2], edges[1::2]
+        long_enough = ends - starts >= MIN_DIGITS
+        starts, ends = starts[long_enough], ends[long_enough]
+        joins = np.flatnonzero(joinable)
+        separators = np.searchsorted(joins, ends) - np.searchsorted(joins, starts)
+        return starts, ends, ends - starts - separators
+
+    def _scan_numpy(data):
+        buf = np.frombuffer(data, dtype=np.uint8)
+        if len(buf) < MIN_DIGITS:
+            return []
+        starts, ends, digits = _tokens_numpy(buf)
+        keep = digits >= MIN_DIGITS
+        starts, ends, digits = starts[keep], ends[keep], digits[keep]
+        if not len(starts):
+            return []
+
+        # Same boundary rules as _free_standing: not glued to a word, not part of a decimal
+        before = np.where(starts > 0, buf[np.maximum(starts - 1, 0)], 32)
+        after = np.where(ends < len(buf), buf[np.minimum(ends, len(buf) - 1)], 32)
+        after_next = np.where(ends + 1 < len(buf), buf[np.minimum(ends + 1, len(buf) - 1)], 32)
+        free = ~_WORD_BYTE[before] & (before != 46) & ~_WORD_BYTE[after] & ~((after == 46) & ((after_next - 48) < 10))
+        starts, ends, digits = starts[free], ends[free], digits[free]
+
+        bare = digits == ends - starts
+        context = _ContextIndex(data)
+        found = _scan_grouped_numpy(buf, data, starts[~bare], ends[~bare])
+        for length in range(MIN_DIGITS, MAX_DIGITS + 1):
+            run_starts = starts[bare & (digits == length)]
+            if not len(run_starts):
+                continue
+            matrix = (buf[run_starts[:, None] + np.arange(length)] - 48).astype(np.int32)
+            if length >= 13:
+                found.extend(_confirm(data, run_starts, length, matrix, (CREDIT_CARD,)))
+            else:
+                found.extend(_confirm(data, run_starts, length, matrix, _CONTEXT_ENTITIES.get(length, ()), context))
+        return found
+
+    def _iban_candidates(buf, data):
+        """IBAN regex matches, tried only where two capitals and two digits start a word."""
+        if len(buf) < 15:
+            return []
+        upper = (buf - 65) < 26
+        digit = (buf - 48) < 10
+        head = upper[:-3] & upper[1:-2] & digit[2:-1] & digit[3:]
+        head[1:] &= ~(_WORD_BYTE[buf[:-4]] & (buf[:-4] != 95))
+        matches, covered = [], 0
+        for at in np.flatnonzero(head).tolist():
+            match = _IBAN.match(data, at) if at >= covered else None
+            if match:
+                matches.append(match)
+                covered = match.end()
+        return matches
+
+    class _ContextIndex:
+        """Keyword positions per entity, found once per buffer on first use."""
+
+        def __init__(self, data):
+            self.data = data
+            self.lowered = None
+            self.spans = {}
+
+        def _find(self, entity):
+            if self.lowered is None:
+                self.lowered = self.data.lower()
+            spans = []
+            for keyword in CONTEXT_KEYWORDS[entity]:
+                at = self.lowered.find(keyword)
+                while at >= 0:
+                    spans.append((at, at + len(keyword)))
+                    at = self.lowered.find(keyword, at + 1)
+            spans.sort(key=lambda span: span[1])
+            return (np.array([span[0] for span in spans], dtype=np.int64),
+                    np.array([span[1] for span in spans], dtype=np.int64))
+
+        def mask(self, entity, row_starts):
+            """Rows with a keyword for entity ending in the CONTEXT_WINDOW bytes before them."""
+            if entity not in self.spans:
+                self.spans[entity] = self._find(entity)
+            keyword_starts, keyword_ends = self.spans[entity]
+            if not len(keyword_ends):
+                return np.zeros(len(row_starts), dtype=bool)
+            last = np.searchsorted(keyword_ends, row_starts, side="right") - 1
+            return (last >= 0) & (keyword_starts[np.maximum(last, 0)] >= row_starts - CONTEXT_WINDOW)
+
+    def _scan_grouped_numpy(buf, data, starts, ends):
+        """Separated numbers laid out exactly like a printed format are verified as matrices."""
+        found = []
+        sizes = ends - starts
+        matched = np.zeros(len(starts), dtype=bool)
+        for size, templates in _TEMPLATES.items():
+            rows = np.flatnonzero(sizes == size)
+            if not len(rows):
+                continue
+            window = buf[starts[rows, None] + np.arange(size)]
+            separators = ((window - 48) >= 10) @ (np.int64(1) << np.arange(size, dtype=np.int64))
+            for mask, columns, entities in templates:
+                hit = separators == mask
+                if not hit.any():
+                    continue
+                matched[rows[hit]] = True
+                matrix = (window[hit][:, columns] - 48).astype(np.int32)
+                found.extend(_confirm(data, starts[rows[hit]], size, matrix, entities, columns=columns))
+        for start, end in zip(starts[~matched].tolist(), ends[~matched].tolist()):
+            found.extend(_classify_grouped(data[start:end], data, start))
+        return found
+
+    def _confirm(data, row_starts, size, matrix, entities, context=None, columns=None):
+        """Rows passing the vectorized checksum (and context, if given), re-checked exactly."""
+        found = []
+        for entity in entities:
+            passed = _checksum_matrix(entity, matrix)
+            if context is not None and passed.any():
+                passed &= context.mask(entity, row_starts)
+            for row in np.flatnonzero(passed).tolist():
+                start = int(row_starts[row])
+                digits = data[start:start + size].decode("ascii")
+                if columns is not None:
+                    digits = "".join(digits[c] for c in columns)
+                if _VALIDATORS[entity](digits):
+                    found.append((entity, digits))
+        return found
+
+    def _checksum_matrix(entity, matrix):
+        """Checksum mask over a matrix with one identifier's digits per row."""
+        length = matrix.shape[1]
+        if entity == CREDIT_CARD:
+            p4 = matrix[:, :4] @ np.array([1000, 100, 10, 1], dtype=np.int32)
+            reversed_digits = matrix[:, ::-1]
+            luhn = reversed_digits[:, 0::2].sum(axis=1) + _LUHN_TABLE[reversed_digits[:, 1::2]].sum(axis=1)
+            return card_prefix_valid(p4 // 100, p4 // 10, p4, length) & (luhn % 10 == 0)
+        if entity == AU_TFN:
+            return (matrix @ np.array(_TFN_WEIGHTS[length], dtype=np.int32)) % 11 == 0
+        if entity == AU_ACN:
+            check = (10 - (matrix[:, :8] @ np.array(_ACN_WEIGHTS, dtype=np.int32)) % 10) % 10
+            return check == matrix[:, 8]
+        if entity == AU_ABN:
+            return ((matrix @ np.array(_ABN_WEIGHTS, dtype=np.int32)) - _ABN_WEIGHTS[0]) % 89 == 0
+        if entity == AU_MEDICARE:
+            check = (matrix[:, :8] @ np.array(_MEDICARE_WEIGHTS, dtype=np.int32)) % 10
+            return (check == matrix[:, 8]) & (matrix[:, 0] >= 2) & (matrix[:, 0] <= 6)
+        # US_SSN: area 001-899 except 666, group 01-99, serial 0001-9999
+        area = matrix[:, :3] @ np.array([100, 10, 1], dtype=np.int32)
+        group = matrix[:, 3:5] @ np.array([10, 1], dtype=np.int32)
+        serial = matrix[:, 5:] @ np.array([1000, 100, 10, 1], dtype=np.int32)
+        return (area > 0) & (area < 900) & (area != 666) & (group > 0) & (serial > 0)
+
+
+def scan_bytes(data, use_numpy=NUMPY_AVAILABLE):
+    """(entity, value) pairs for every verified identifier in UTF-8 bytes."""
+    if use_numpy:
+        return _scan_numpy(data) + _scan_ibans(data, _iban_candidates(np.frombuffer(data, dtype=np.uint8), data))
+    return _scan_python(data) + _scan_ibans(data)
+
+
+def find_numeric_identifiers(text, use_numpy=NUMPY_AVAILABLE):
+    """(entity, value) pairs for every verified identifier in text."""
+    return scan_bytes(text.encode("utf-8"), use_numpy)
+
+
+def check_numeric_identifiers(text):
+    """Violation dict when text contains a verified identifier, else None."""
+    found = find_numeric_identifiers(text)
+    if not found:
+        return None
+    print(f"[NumericIds] Verified identifiers found: {sorted({entity for entity, _ in found})}")
+    return dict(NUMERIC_ID_VIOLATION)
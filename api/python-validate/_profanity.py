@@ -0,0 +1,92 @@
+"""
+Local profanity filter: a single compiled word-list regex, no network.
+
+Text is lowercased and common leetspeak substitutions between letters are
+undone before matching, and matches are anchored on word boundaries so words that merely
+contain a listed word (e.g. "Scunthorpe", "assessment") are not flagged.
+Only INFLECTED_STEMS also match with a suffix ("fucking", "bitches");
+words with a benign sense ("cock", "prick") match exactly, so "cocky" or
+"pricked" pass, and their profane inflections are listed explicitly.
+Extra words can be added, one per line, from HAIVEN_PROFANITY_WORDS_FILE;
+they match exactly.
+A prebuilt validator bundle carries the expanded pattern instead.
+"""
+
+import os
+import re
+
+from _bundle import BUNDLE
+
+PROFANITY_WORDS = [
+    "arse", "arsehole", "ass", "asshat", "asshole", "bastard", "bitch", "bollocks",
+    "bullshit", "clusterfuck", "cock", "cocksucker", "crap", "cunt", "dick",
+    "dickhead", "douche", "douchebag", "dumbass", "fuck", "fucker", "fuckface",
+    "fuckhead", "fucking", "goddamn", "goddamnit", "horseshit", "jackass",
+    "jerkoff", "motherfucker", "piss", "pissed", "pissing", "prick", "pussy", "shit",
+    "shithead", "shitty", "slut", "twat", "wanker", "whore", "crappy", "dickheads", "motherfucking",
+]
+
+# Stems that stay profane with any of the suffixes in matcher_pattern
+INFLECTED_STEMS = {
+    "arsehole", "asshat", "asshole", "bastard", "bitch", "bullshit", "clusterfuck", "cocksucker",
+    "cunt", "douchebag", "dumbass", "fuck", "fucker", "fuckface", "fuckhead", "horseshit", "jackass",
+    "motherfucker", "shit", "shithead", "slut", "twat", "wanker", "whore",
+}
+
+PROFANITY_VIOLATION = {
+    "type": "Profanity",
+    "message": "Profane language detected",
+    "severity": "medium"
+}
+
+# Undo the usual character substitutions before matching, but only inside a
+# word ("sh1t", "f*ck", "a$$hole"): leading, trailing or standalone digits are
+# left alone so codes like "A55" or "7W4T" are not read as words
+_LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a", "$": "s", "!": "i", "*": "u"})
+_LEET_RUN = re.compile(r"(?<=[a-z])[013457@$!*]+(?=[a-z])")
+
+
+def fold_leetspeak(text):
+    return _LEET_RUN.sub(lambda m: m.group().translate(_LEET), text.lower())
+
+
+def _load_words():
+    words = set(PROFANITY_WORDS)
+    extra_path = os.environ.get("HAIVEN_PROFANITY_WORDS_FILE")
+    if extra_path:
+        with open(extra_path, encoding="utf-8") as f:
+            words.update(line.strip().lower() for line in f if line.strip() and not line.startswith("#"))
+    return words
+
+
+def matcher_pattern(words):
+    def alternation(group):
+        # Longest first so alternation prefers "motherfucker" over "fuck"
+        return "|".join(re.escape(word) for word in sorted(group, key=len, reverse=True))
+    inflected = alternation(INFLECTED_STEMS)
+    exact = alternation(set(words) - INFLECTED_STEMS)
+    return rf"(?<![a-z])(?:(?:{inflected})(?:s|es|ed|er|ers|ing|y)?|(?:{exact}))(?![a-z])"
+
+
+def compile_matcher(words):
+    return re.compile(matcher_pattern(words))
+
+
+if BUNDLE is not None and BUNDLE.tables and "profanity" in BUNDLE.tables:
+    _MATCHER = re.compile(BUNDLE.tables["profanity"])
+else:
+    _MATCHER = compile_matcher(_load_words())
+
+
+def find_profanity(text):
+    """List of profane words found in text."""
+    return _MATCHER.findall(fold_leetspeak(text))
+
+
+def check_profanity(text):
+    """Violation dict when text contains profanity, else None."""
+    found = find_profanity(text)
+    if not found:
+        return None
+    print(f"[Profanity] {len(found)} profane words found")
+    return dict(PROFANITY_VIOLATION)
@@ -0,0 +1,224 @@
+"""
+On-demand profiling for live validator workers.
+
+An admin starts a session that runs for N seconds or N validate requests,
+whichever comes first, then fetches the report:
+
+- "cpu": a sampler thread snapshots every thread's Python stack at a fixed
+  interval and counts them as collapsed stacks ("a;b;c 42" lines, the
+  input format of flamegraph.pl and speedscope).
+- "alloc": tracemalloc runs for the session and the report lists the call
+  sites holding the most newly allocated memory.
+
+Nothing is installed while no session is running. Request paths only check
+PROFILER.active before counting a request, so there is no cost when off.
+
+The admin surface is disabled unless HAIVEN_ADMIN_TOKEN is set; callers
+must send the same value in the X-Haiven-Admin-Token header.
+"""
+
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+ADMIN_TOKEN = os.environ.get("HAIVEN_ADMIN_TOKEN")
+ADMIN_TOKEN_HEADER = "X-Haiven-Admin-Token"
+
+DEFAULT_SECONDS = float(os.environ.get("HAIVEN_PROFILE_SECONDS", "10"))
+# Hard cap, so a forgotten session cannot run for hours
+MAX_SECONDS = float(os.environ.get("HAIVEN_PROFILE_MAX_SECONDS", "300"))
+DEFAULT_INTERVAL_MS = float(os.environ.get("HAIVEN_PROFILE_INTERVAL_MS", "5"))
+ALLOC_FRAMES = int(os.environ.get("HAIVEN_PROFILE_ALLOC_FRAMES", "10"))
+
+# Leaf frames of threads that are parked rather than working (waiting on a
+# lock, a queue or a socket); dropped from CPU profiles unless asked for
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("socket.py", "accept"),
+    ("socket.py", "readinto"),
+    ("socketserver.py", "serve_forever"),
+    ("thread.py", "_worker"),
+    ("_batcher.py", "_run"),
+    ("base_events.py", "_run_once"),
+}
+
+# Startup costs (e.g. the Guardrails import) that sampling can never see,
+# recorded by the entry points and included in every status report
+STARTUP_TIMINGS = {}
+
+
+class ProfilerBusy(RuntimeError):
+    """Raised when a session is started while another is still running."""
+
+
+def admin_authorized(header_value):
+    """True when the admin surface is enabled and the caller sent its token."""
+    if not ADMIN_TOKEN or not header_value:
+        return False
+    return hmac.compare_digest(header_value.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
+
+
+def record_startup(name, started_at):
+    """Record how long a startup step took, from a time.perf_counter() start."""
+    STARTUP_TIMINGS[name] = round((time.perf_counter() - started_at) * 1000, 2)
+
+
+def _short_path(filename):
+    return "/".join(filename.replace("\\", "/").rsplit("/", 2)[-2:])
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _thread_label(name):
+    # "Thread-12 (process_request_thread)" and "guardrails_3" fold into one root per pool
+    return re.sub(r"[-_]\d+", "", name)
+
+
+class Profiler:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self.active = False
+        self._session = None
+        self._last_report = None
+
+    def start(self, mode="cpu", seconds=None, requests=None, interval_ms=None, top=30, include_idle=False):
+        """Start a session; it ends after `seconds` or `requests` validate calls."""
+        if mode not in ("cpu", "alloc"):
+            raise ValueError("mode must be 'cpu' or 'alloc'")
+        seconds = min(float(seconds or DEFAULT_SECONDS), MAX_SECONDS)
+        if seconds <= 0:
+            raise ValueError("seconds must be positive")
+        if requests is not None and int(requests) <= 0:
+            raise ValueError("requests must be positive")
+        interval_s = max(float(interval_ms or DEFAULT_INTERVAL_MS), 0.5) / 1000.0
+
+        with self._lock:
+            if self.active:
+                raise ProfilerBusy("A profiling session is already running")
+            self._session = {
+                "mode": mode,
+                "seconds": seconds,
+                "requests": int(requests) if requests else None,
+                "interval_ms": interval_s * 1000,
+                "top": int(top),
+                "include_idle": bool(include_idle),
+                "started_at": time.time(),
+                "requests_seen": 0,
+            }
+            self._done.clear()
+            if mode == "alloc":
+                tracemalloc.start(ALLOC_FRAMES)
+            self.active = True
+
+        print(f"[Profiler] Started {mode} session ({seconds}s, requests={requests})")
+        threading.Thread(target=self._run, args=(self._session, interval_s), name="profiler", daemon=True).start()
+        return self.status()
+
+    def note_request(self):
+        """Count one finished validate request; callers check `active` first."""
+        session = self._session
+        if session is None or not self.active:
+            return
+        session["requests_seen"] += 1
+        if session["requests"] and session["requests_seen"] >= session["requests"]:
+            self._done.set()
+
+    def stop(self):
+        """End the running session early; its report is still produced."""
+        self._done.set()
+
+    def status(self):
+        with self._lock:
+            session = self._session
+            if self.active and session is not None:
+                return {
+                    "state": "running",
+                    "mode": session["mode"],
+                    "elapsed_s": round(time.time() - session["started_at"], 2),
+                    "requests_seen": session["requests_seen"],
+                    "startup_ms": dict(STARTUP_TIMINGS),
+                }
+            if self._last_report is None:
+                return {"state": "idle", "startup_ms": dict(STARTUP_TIMINGS)}
+            return dict(self._last_report, state="done", startup_ms=dict(STARTUP_TIMINGS))
+
+    def _run(self, session, interval_s):
+        deadline = time.monotonic() + session["seconds"]
+        stacks = Counter()
+        samples = 0
+        own_id = threading.get_ident()
+        # Alloc sessions only need to notice the end of the session
+        wait_s = interval_s if session["mode"] == "cpu" else 0.1
+
+        while not self._done.wait(wait_s) and time.monotonic() < deadline:
+            if session["mode"] == "cpu":
+                samples += self._sample(stacks, own_id, session["include_idle"])
+
+        if session["mode"] == "cpu":
+            report = {"samples": samples, "collapsed": [f"{stack} {count}" for stack, count in stacks.most_common()]}
+        else:
+            report = self._allocation_report(session["top"])
+
+        report.update(
+            mode=session["mode"],
+            duration_s=round(time.time() - session["started_at"], 2),
+            requests_seen=session["requests_seen"],
+            interval_ms=session["interval_ms"] if session["mode"] == "cpu" else None,
+        )
+        with self._lock:
+            self._last_report = report
+            self.active = False
+        print(f"[Profiler] Finished {session['mode']} session after {report['duration_s']}s, {report['requests_seen']} requests")
+
+    def _sample(self, stacks, own_id, include_idle):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        taken = 0
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            code = frame.f_code
+            if not include_idle and (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            labels.append(_thread_label(names.get(thread_id, "thread")))
+            stacks[";".join(reversed(labels))] += 1
+            taken += 1
+        return taken
+
+    def _allocation_report(self, top):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        allocations = []
+        for stat in snapshot.statistics("traceback")[:top]:
+            allocations.append({
+                "size_kb": round(stat.size / 1024, 1),
+                "count": stat.count,
+                "traceback": [f"{_short_path(frame.filename)}:{frame.lineno}" for frame in stat.traceback],
+            })
+        return {
+            "traced_kb": round(current / 1024, 1),
+            "peak_kb": round(peak / 1024, 1),
+            "top_allocations": allocations,
+        }
+
+
+PROFILER = Profiler()
@@ -0,0 +1,103 @@
+"""
+Validation against an HTTP inference endpoint instead of the Guardrails hub.
+
+Enabled by setting HAIVEN_INFERENCE_URL, e.g. to the local stand-in started
+by scripts/mock_inference_server.py. PII and financial/medical entities are
+detected remotely; every other validator uses the fallback patterns. Calls
+go through the shared pooled, batching client in _inference_client.py.
+
+pooled_hub_validator() routes a hub validator's own remote inference
+(GUARDRAILS_ENABLE_REMOTE_INFERENCING) through the same client.
+"""
+
+import json
+import os
+
+from _fallback import FALLBACK_VALIDATORS
+from _inference_client import INFERENCE_CLIENT, InferenceClient
+from _scheduler import ValidatorScheduler
+
+INFERENCE_URL = os.environ.get("HAIVEN_INFERENCE_URL")
+INFERENCE_TIMEOUT_S = float(os.environ.get("HAIVEN_INFERENCE_TIMEOUT_S", "10"))
+
+# Shadow evaluation (_shadow.py) gets its own small client, so sampled
+# traffic never takes live connections, concurrency slots or batch places
+SHADOW_INFERENCE_CLIENT = InferenceClient(
+    max_concurrency=int(os.environ.get("HAIVEN_SHADOW_INFERENCE_CONCURRENCY", "1")), retries=0)
+
+# Same entity sets the Guardrails path asks DetectPII for
+REMOTE_ENTITY_VALIDATORS = {
+    "PII Detection": (
+        ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER"],
+        {"type": "PII Detection", "message": "Personal identifiable information detected", "severity": "high"},
+    ),
+    "Financial & Medical Data": (
+        ["US_SSN", "CREDIT_DEBIT_CARD_NUMBER", "MEDICAL_LICENSE"],
+        {"type": "Sensitive Data", "message": "Sensitive financial or medical information detected", "severity": "high"},
+    ),
+}
+
+
+def detect_entities(text, entities, url=None, timeout=None, client=INFERENCE_CLIENT):
+    """Return the entities the endpoint found in text (batched with concurrent calls)."""
+    return client.detect(url or INFERENCE_URL, text, entities, timeout or INFERENCE_TIMEOUT_S)
+
+
+def pooled_hub_validator(cls, client=INFERENCE_CLIENT):
+    """
+    Subclass of a Guardrails hub validator whose remote inference requests
+    use client (pooled connections, concurrency cap, retries)
+    instead of one requests.post per call. Validators without remote
+    inference are returned unchanged.
+    """
+    if not hasattr(cls, "_hub_inference_request"):
+        return cls
+
+    class PooledValidator(cls):
+        def _hub_inference_request(self, request_body, validation_endpoint):
+            if isinstance(request_body, (str, bytes)):
+                request_body = json.loads(request_body)
+            token = getattr(self, "hub_jwt_token", None)
+            headers = {"Authorization": f"Bearer {token}"} if token else None
+            return client.post_json(validation_endpoint, request_body, INFERENCE_TIMEOUT_S, headers)
+
+    PooledValidator.__name__ = PooledValidator.__qualname__ = cls.__name__
+    return PooledValidator
+
+
+def _remote_validator(name, entities, violation):
+    def run(text):
+        found = detect_entities(text, entities)
+        print(f"[Remote] {name}: {len(found)} entities found")
+        return [dict(violation)] if found else []
+    return run
+
+
+REMOTE_VALIDATORS = {
+    name: _remote_validator(name, entities, violation)
+    for name, (entities, violation) in REMOTE_ENTITY_VALIDATORS.items()
+}
+
+REMOTE_SCHEDULER = ValidatorScheduler("remote")
+
+
+def validate_with_remote_inference(text, enabled_validators, full_scan=False):
+    """
+    Same contract as validate_with_guardrails. Inference failures raise
+    InferenceError so the deadline wrapper can degrade and trip its breaker.
+    """
+    validators = []
+    for name in enabled_validators:
+        validator = REMOTE_VALIDATORS.get(name) or FALLBACK_VALIDATORS.get(name)
+        if validator:
+            validators.append((name, validator))
+
+    violations, skipped = REMOTE_SCHEDULER.run(validators, text, stop_on_block=not full_scan)
+
+    return {
+        "passed": not violations,
+        "original_text": text,
+        "sanitized_text": None,
+        "violations": violations,
+        "skipped_validators": skipped
+    }
@@ -0,0 +1,90 @@
+"""
+Cost-based ordering of the enabled validators, with short-circuit on block.
+
+Every validator run is timed and its outcome recorded; exponentially
+weighted averages of cost and hit (block) rate are kept per validator. When
+any blocking violation is enough to reject (the chat path), validators run
+cheapest-per-expected-block first, i.e. by cost / hit rate, and the run
+stops at the first one that blocks. Audit callers run the full set, which
+also keeps the statistics of rarely reached validators fresh.
+"""
+
+import os
+import threading
+import time
+
+# Weight of the newest observation in the running averages
+ALPHA = float(os.environ.get("HAIVEN_SCHEDULER_ALPHA", "0.05"))
+# Assumed until a validator has been measured, so new validators get tried early
+PRIOR_COST_MS = 1.0
+PRIOR_HIT_RATE = 0.1
+# Floor so a validator that never blocks sorts last instead of dividing by zero
+MIN_HIT_RATE = 0.001
+
+
+class ValidatorScheduler:
+    def __init__(self, name, alpha=ALPHA):
+        self.name = name
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._stats = {}  # validator name -> [cost_ms, hit_rate, runs]
+
+    def _rank(self, name):
+        cost_ms, hit_rate, _ = self._stats.get(name, (PRIOR_COST_MS, PRIOR_HIT_RATE, 0))
+        return cost_ms / max(hit_rate, MIN_HIT_RATE), cost_ms
+
+    def order(self, validators):
+        """Sort (name, fn) pairs by expected cost to find a blocking violation."""
+        with self._lock:
+            return sorted(validators, key=lambda validator: self._rank(validator[0]))
+
+    def record(self, name, elapsed_ms, blocked):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                self._stats[name] = [elapsed_ms, 1.0 if blocked else 0.0, 1]
+                return
+            stats[0] += self.alpha * (elapsed_ms - stats[0])
+            stats[1] += self.alpha * ((1.0 if blocked else 0.0) - stats[1])
+            stats[2] += 1
+
+    def run(self, validators, text, stop_on_block=True):
+        """
+        Run (name, fn) validators on text, where fn returns a list of
+        violation dicts (empty when the text passes). Returns the violations
+        found and the names of validators skipped after a block.
+        """
+        # The same check can be registered under several names; run it once
+        unique = []
+        seen = set()
+        for name, fn in validators:
+            if fn not in seen:
+                seen.add(fn)
+                unique.append((name, fn))
+
+        ordered = self.order(unique) if stop_on_block else unique
+        violations = []
+        for i, (name, fn) in enumerate(ordered):
+            start = time.perf_counter()
+            found = fn(text)
+            self.record(name, (time.perf_counter() - start) * 1000.0, bool(found))
+            if found:
+                violations.extend(found)
+                if stop_on_block:
+                    skipped = [skipped_name for skipped_name, _ in ordered[i + 1:]]
+                    if skipped:
+                        print(f"[Scheduler] {name} blocked; skipping {skipped}")
+                    return violations, skipped
+        return violations, []
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                name: {"cost_ms": round(cost_ms, 3), "hit_rate": round(hit_rate, 4), "runs": runs}
+                for name, (cost_ms, hit_rate, runs) in self._stats.items()
+            }
+
+
+def wants_full_scan(mode):
+    """Audit callers get every violation; everything else stops at the first block."""
+    return mode == "audit"
@@ -0,0 +1,238 @@
+"""
+Shadow evaluation of a candidate PII entity policy on live traffic.
+
+A fraction (HAIVEN_SHADOW_RATE) of validate requests is copied, once the live
+decision is made, into a bounded queue. One background worker runs the
+candidate entity list (HAIVEN_SHADOW_POLICY, e.g. the profile of
+scripts/validate_comprehensive.py) through the same detection engine and
+compares it with the live decision of the PII Detection and Financial &
+Medical Data validators. Only the part of the candidate list covered by the
+live validators that ran on the request is checked (SHADOW_SCOPES), so a
+request that only enabled PII Detection is not charged for card numbers.
+It records agreement, which entities drive disagreements, and live vs
+candidate latency. Nothing the worker finds affects responses.
+
+The worker may use at most HAIVEN_SHADOW_CPU_SHARE of one core, measured
+with time.thread_time plus the CPU of any helper thread the detector hands
+work to (helper_cpu, e.g. the shadow inference client's event loop). Past
+that it sleeps until its budget refills, and samples arriving meanwhile are
+dropped once the queue is full. Request threads never wait on it.
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter, deque
+
+SHADOW_RATE = float(os.environ.get("HAIVEN_SHADOW_RATE", "0"))
+SHADOW_POLICY = os.environ.get("HAIVEN_SHADOW_POLICY", "comprehensive")
+SHADOW_QUEUE = int(os.environ.get("HAIVEN_SHADOW_QUEUE", "64"))
+SHADOW_CPU_SHARE = float(os.environ.get("HAIVEN_SHADOW_CPU_SHARE", "0.05"))
+# CPU the worker may spend in one go after being idle
+SHADOW_CPU_BURST_MS = float(os.environ.get("HAIVEN_SHADOW_CPU_BURST_MS", "200"))
+
+# Entity profiles of scripts/validate_balanced.py and scripts/validate_comprehensive.py
+SHADOW_POLICIES = {
+    "balanced": [
+        "EMAIL_ADDRESS", "EMAIL", "PHONE_NUMBER", "US_SSN", "US_ITIN", "US_PASSPORT", "US_DRIVER_LICENSE",
+        "CREDIT_CARD", "US_BANK_NUMBER", "IBAN_CODE", "CRYPTO", "IP_ADDRESS", "MEDICAL_LICENSE", "UK_NHS",
+        "AU_MEDICARE", "AU_ABN", "AU_ACN", "AU_TFN", "IN_AADHAAR", "IN_PAN", "IN_VEHICLE_REGISTRATION",
+        "SG_NRIC_FIN",
+    ],
+    "comprehensive": [
+        "PERSON", "EMAIL_ADDRESS", "EMAIL", "PHONE_NUMBER", "US_SSN", "US_ITIN", "US_PASSPORT",
+        "US_DRIVER_LICENSE", "CREDIT_CARD", "US_BANK_NUMBER", "IBAN_CODE", "CRYPTO", "LOCATION", "IP_ADDRESS",
+        "URL", "ORGANIZATION", "MEDICAL_LICENSE", "UK_NHS", "AU_MEDICARE", "AU_ABN", "AU_ACN", "AU_TFN",
+        "IN_AADHAAR", "IN_PAN", "IN_VEHICLE_REGISTRATION", "SG_NRIC_FIN", "AGE", "DATE_TIME", "ID", "NRP",
+    ],
+}
+
+# Live validators the candidate policy stands in for, and the violation types they report
+SHADOWED_VALIDATORS = ("PII Detection", "Financial & Medical Data")
+SHADOWED_TYPES = ("PII Detection", "Sensitive Data")
+
+# Candidate entities each live validator is compared on; entities in neither are never checked
+SHADOW_SCOPES = {
+    "PII Detection": {
+        "PERSON", "EMAIL_ADDRESS", "EMAIL", "PHONE_NUMBER", "LOCATION", "IP_ADDRESS", "URL", "ORGANIZATION",
+        "AGE", "DATE_TIME", "NRP",
+    },
+    "Financial & Medical Data": {
+        "US_SSN", "US_ITIN", "US_PASSPORT", "US_DRIVER_LICENSE", "CREDIT_CARD", "US_BANK_NUMBER", "IBAN_CODE",
+        "CRYPTO", "MEDICAL_LICENSE", "UK_NHS", "AU_MEDICARE", "AU_ABN", "AU_ACN", "AU_TFN", "IN_AADHAAR",
+        "IN_PAN", "IN_VEHICLE_REGISTRATION", "SG_NRIC_FIN", "ID",
+    },
+}
+
+# Reported by detectors that only know whether something matched, not what
+UNATTRIBUTED = "UNATTRIBUTED"
+
+# Latency samples kept for the percentiles in snapshot()
+_LATENCY_SAMPLES = 1000
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 2)
+
+
+def _violation_type(violation):
+    # Violation dicts, or model objects with a type attribute (python-api)
+    if isinstance(violation, dict):
+        return violation.get("type")
+    return getattr(violation, "type", None)
+
+
+class ShadowEvaluator:
+    """
+    detector(text, entities) returns the entity types it found (empty when
+    the text passes); None disables shadowing, e.g. on the regex fallback.
+    helper_cpu() returns the CPU seconds used so far by threads the detector
+    offloads work to, so that work counts against the CPU share too.
+    """
+
+    def __init__(self, name, detector, policy=SHADOW_POLICY, rate=SHADOW_RATE, queue_size=SHADOW_QUEUE,
+                 cpu_share=SHADOW_CPU_SHARE, cpu_burst_ms=SHADOW_CPU_BURST_MS, helper_cpu=None):
+        self.name = name
+        self.detector = detector
+        self.helper_cpu = helper_cpu
+        self.policy = policy
+        self.entities = SHADOW_POLICIES.get(policy)
+        self.rate = rate if detector is not None and self.entities else 0.0
+        if rate > 0 and not self.rate:
+            print(f"[Shadow] Disabled: no detection engine or unknown policy {policy!r}")
+        self.cpu_share = max(0.001, cpu_share)
+        self.cpu_burst_s = cpu_burst_ms / 1000.0
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._lock = threading.Lock()
+        self._worker = None
+        self._cpu_budget_s = self.cpu_burst_s
+        self._budget_at = time.monotonic()
+        self.counts = Counter()
+        self.scopes = Counter()
+        self.candidate_only_entities = Counter()
+        self._live_ms = deque(maxlen=_LATENCY_SAMPLES)
+        self._candidate_ms = deque(maxlen=_LATENCY_SAMPLES)
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def offer(self, text, enabled_validators, result, live_ms):
+        """Maybe queue a finished request for shadowing; never blocks or raises."""
+        if not self.enabled or random.random() >= self.rate:
+            return
+        try:
+            self._offer(text, enabled_validators, result, live_ms)
+        except Exception as e:
+            # Shadowing must never fail the request it samples
+            print(f"[Shadow] Could not sample request: {e}")
+            self._count("sample_errors")
+
+    def _offer(self, text, enabled_validators, result, live_ms):
+        scope = tuple(name for name in SHADOWED_VALIDATORS if name in enabled_validators)
+        if result.get("degraded") or not scope:
+            return
+        entities = self._scoped_entities(scope)
+        if not entities:
+            return
+        live_blocked = any(_violation_type(violation) in SHADOWED_TYPES for violation in result.get("violations") or [])
+        skipped = result.get("skipped_validators") or []
+        if not live_blocked and any(name in skipped for name in SHADOWED_VALIDATORS):
+            # Short-circuited before the PII validators ran, so there is no live decision to compare
+            self._count("inconclusive")
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((text, scope, entities, live_blocked, live_ms))
+            self._count("queued")
+        except queue.Full:
+            self._count("dropped")
+
+    def _scoped_entities(self, scope):
+        """The candidate entities the live validators in scope are responsible for."""
+        covered = set().union(*(SHADOW_SCOPES[name] for name in scope))
+        return [entity for entity in self.entities or [] if entity in covered]
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _ensure_worker(self):
+        if self._worker is None:
+            with self._lock:
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._run, name=f"shadow-{self.name}", daemon=True)
+                    self._worker.start()
+
+    def _wait_for_cpu_budget(self):
+        """Refill the CPU budget for the wall time passed; sleep while it is spent."""
+        now = time.monotonic()
+        self._cpu_budget_s = min(self.cpu_burst_s, self._cpu_budget_s + (now - self._budget_at) * self.cpu_share)
+        self._budget_at = now
+        if self._cpu_budget_s < 0:
+            self._count("throttled")
+            time.sleep(-self._cpu_budget_s / self.cpu_share)
+            self._cpu_budget_s = 0.0
+            self._budget_at = time.monotonic()
+
+    def _run(self):
+        while True:
+            text, scope, entities, live_blocked, live_ms = self._queue.get()
+            self._wait_for_cpu_budget()
+            cpu_started_at = self._cpu_time()
+            started_at = time.perf_counter()
+            try:
+                found = self.detector(text, entities)
+            except Exception as e:
+                print(f"[Shadow] Candidate policy {self.policy} failed: {e}")
+                self._count("errors")
+                continue
+            finally:
+                del text
+                self._cpu_budget_s -= self._cpu_time() - cpu_started_at
+            self._record(scope, live_blocked, bool(found), found, live_ms, (time.perf_counter() - started_at) * 1000)
+
+    def _cpu_time(self):
+        spent = time.thread_time()
+        if self.helper_cpu is not None:
+            spent += self.helper_cpu()
+        return spent
+
+    def _record(self, scope, live_blocked, candidate_blocked, found, live_ms, candidate_ms):
+        if live_blocked == candidate_blocked:
+            outcome = "agree_block" if live_blocked else "agree_pass"
+        else:
+            outcome = "live_only_block" if live_blocked else "candidate_only_block"
+        with self._lock:
+            self.counts["evaluated"] += 1
+            self.counts[outcome] += 1
+            self.scopes[" + ".join(scope)] += 1
+            if outcome == "candidate_only_block":
+                self.candidate_only_entities.update(set(found))
+            self._live_ms.append(live_ms)
+            self._candidate_ms.append(candidate_ms)
+
+    def snapshot(self):
+        with self._lock:
+            counts = dict(self.counts)
+            evaluated = counts.get("evaluated", 0)
+            agreed = counts.get("agree_block", 0) + counts.get("agree_pass", 0)
+            return {
+                "enabled": self.enabled,
+                "policy": self.policy,
+                "rate": self.rate,
+                "queue_depth": self._queue.qsize(),
+                "cpu_share": self.cpu_share,
+                "counts": counts,
+                "scopes": dict(self.scopes),
+                "agreement": round(agreed / evaluated, 4) if evaluated else None,
+                "candidate_only_entities": dict(self.candidate_only_entities.most_common(10)),
+                "live_ms": {"p50": _percentile(self._live_ms, 0.5), "p95": _percentile(self._live_ms, 0.95)},
+                "candidate_ms": {"p50": _percentile(self._candidate_ms, 0.5),
+                                 "p95": _percentile(self._candidate_ms, 0.95)},
+            }
@@ -0,0 +1,136 @@
+"""
+Local toxic language classifier, no network.
+
+A logistic model over word unigram and bigram features. The built-in
+weights are a hand-tuned lexicon (insults, threats, abuse aimed at the
+reader); trained weights can be supplied as JSON via HAIVEN_TOXICITY_MODEL
+({"bias": float, "weights": {"feature": float}}). score_batch scores many
+texts per call, vectorized with numpy when it is installed, and concurrent
+requests are funnelled through a MicroBatcher so they share those calls.
+"""
+
+import json
+import math
+import os
+import re
+
+from _batcher import MicroBatcher
+from _bundle import BUNDLE
+from _profanity import fold_leetspeak
+
+try:
+    import numpy as np  # type: ignore
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+TOXICITY_THRESHOLD = float(os.environ.get("HAIVEN_TOXICITY_THRESHOLD", "0.5"))
+
+TOXIC_VIOLATION = {
+    "type": "Toxic Language",
+    "message": "Toxic or abusive language detected",
+    "severity": "high"
+}
+
+DEFAULT_BIAS = -2.0
+
+DEFAULT_WEIGHTS = {
+    # Insults
+    "idiot": 2.5, "idiots": 2.5, "moron": 2.5, "morons": 2.5, "imbecile": 2.5, "stupid": 1.5,
+    "dumb": 1.4, "loser": 1.8, "pathetic": 1.6, "worthless": 2.0, "useless": 1.0, "ugly": 1.2,
+    "disgusting": 1.3, "scum": 2.5, "trash": 1.0, "garbage": 0.8, "retard": 3.0, "retarded": 3.0,
+    "freak": 1.4, "creep": 1.2, "clown": 0.8, "ignorant": 1.0, "incompetent": 1.0,
+    # Profanity used as abuse
+    "fuck": 1.2, "fucking": 1.0, "shit": 0.8, "bitch": 2.2, "bastard": 2.0, "asshole": 2.5,
+    "cunt": 3.0, "dickhead": 2.5, "wanker": 2.2, "twat": 2.5, "prick": 1.8, "whore": 2.8, "slut": 2.8,
+    # Hostility and threats
+    "hate": 1.3, "kill": 0.8, "die": 1.0, "hurt": 0.6, "destroy": 0.5, "threat": 0.5,
+    # Bigrams; being addressed directly is what makes an insult personal, so
+    # "you" only carries weight next to the insult, never on its own
+    "you idiot": 1.5, "you moron": 1.5, "you are": 0.3, "are stupid": 1.5, "are pathetic": 1.5,
+    "are worthless": 1.5, "are useless": 1.5, "youre stupid": 1.5, "youre pathetic": 1.5,
+    "youre worthless": 1.5, "youre useless": 1.5, "you stupid": 1.5, "you useless": 1.5,
+    "you pathetic": 1.5, "you worthless": 1.5, "are an": 0.5, "an idiot": 0.5, "a moron": 0.5,
+    "hate you": 1.5, "kill you": 3.5, "hurt you": 3.0,
+    "kill yourself": 4.5, "go die": 2.5, "should die": 2.5, "shut up": 1.8, "fuck you": 3.0,
+    "fuck off": 2.5, "piece of": 0.5, "of shit": 1.5, "find you": 1.5, "beat you": 2.5,
+    # Common benign contexts that share a word with the lexicon
+    "kill the": -1.0, "kill process": -1.5, "die cast": -2.0, "hate to": -1.0, "hate it": -0.5,
+    "idiot proof": -3.0, "idiot proofed": -3.0,
+}
+
+_TOKEN = re.compile(r"[a-z]+")
+
+
+def features(text):
+    tokens = _TOKEN.findall(fold_leetspeak(text.replace("'", "")))
+    return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class ToxicityModel:
+    def __init__(self, weights, bias):
+        self.bias = bias
+        self.weights = weights
+        if NUMPY_AVAILABLE:
+            self.vocab = {feature: i for i, feature in enumerate(weights)}
+            self.weight_array = np.array(list(weights.values()), dtype=np.float64)
+
+    @classmethod
+    def load(cls):
+        model_path = os.environ.get("HAIVEN_TOXICITY_MODEL")
+        if model_path:
+            with open(model_path) as f:
+                model = json.load(f)
+            print(f"[Toxicity] Loaded {len(model['weights'])} weights from {model_path}")
+            return cls(model["weights"], model.get("bias", DEFAULT_BIAS))
+        if BUNDLE is not None and BUNDLE.toxicity:
+            return cls(BUNDLE.toxicity["weights"], BUNDLE.toxicity.get("bias", DEFAULT_BIAS))
+        return cls(DEFAULT_WEIGHTS, DEFAULT_BIAS)
+
+    def score_batch(self, texts):
+        """Toxicity probability for each text, in order."""
+        if NUMPY_AVAILABLE:
+            return self._score_batch_numpy(texts)
+        weights = self.weights
+        scores = []
+        for text in texts:
+            logit = self.bias + sum(weights.get(feature, 0.0) for feature in features(text))
+            scores.append(1.0 / (1.0 + math.exp(-logit)))
+        return scores
+
+    def _score_batch_numpy(self, texts):
+        # One gather and one segmented sum over the known features of the whole batch
+        vocab = self.vocab
+        indices = []
+        owners = []
+        for row, text in enumerate(texts):
+            for feature in features(text):
+                i = vocab.get(feature)
+                if i is not None:
+                    indices.append(i)
+                    owners.append(row)
+        logits = np.full(len(texts), self.bias, dtype=np.float64)
+        if indices:
+            np.add.at(logits, np.array(owners), self.weight_array[np.array(indices)])
+        return (1.0 / (1.0 + np.exp(-logits))).tolist()
+
+    def score(self, text):
+        return self.score_batch([text])[0]
+
+
+MODEL = ToxicityModel.load()
+_batcher = MicroBatcher(MODEL.score_batch, max_batch=64, name="toxicity-batcher")
+
+
+def score_toxicity(text):
+    """Score one text, batched with concurrent callers."""
+    return _batcher.submit(text)
+
+
+def check_toxicity(text):
+    """Violation dict when text scores above the toxicity threshold, else None."""
+    score = score_toxicity(text)
+    print(f"[Toxicity] score={score:.3f}")
+    if score < TOXICITY_THRESHOLD:
+        return None
+    return dict(TOXIC_VIOLATION)
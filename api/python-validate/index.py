@@ -1,101 +1,252 @@
 # Version: 2.0 - Python Serverless Function (Node.js route removed)
 from http.server import BaseHTTPRequestHandler
-import json
 import os
-import re
+import sys
+import time
+from urllib.parse import parse_qs, urlsplit
+
+# Shared helpers live next to this file; Vercel only exposes index.py itself
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _codec import (  # noqa: E402
+    CODEC_NAME,
+    PayloadTooLarge,
+    dumps,
+    loads,
+    parse_content_length,
+    read_body,
+    shape_response,
+)
+from _admission import PRIORITY_HEADER, AdmissionController, Overloaded, parse_priority  # noqa: E402
+from _bundle import BUNDLE, import_hub_validator, warm_up  # noqa: E402
+from _deadline import CircuitBreaker, request_deadline, validate_with_deadline  # noqa: E402
+from _fallback import FALLBACK_VALIDATORS, validate_with_fallback_patterns  # noqa: E402
+from _fingerprint import check_confidential_documents  # noqa: E402
+from _profiler import ADMIN_TOKEN_HEADER, PROFILER, ProfilerBusy, admin_authorized, record_startup  # noqa: E402
+from _profanity import check_profanity  # noqa: E402
+from _toxicity import check_toxicity  # noqa: E402
+from _remote import (  # noqa: E402
+    INFERENCE_CLIENT,
+    INFERENCE_URL,
+    REMOTE_SCHEDULER,
+    SHADOW_INFERENCE_CLIENT,
+    detect_entities,
+    pooled_hub_validator,
+    validate_with_remote_inference,
+)
+from _scheduler import ValidatorScheduler, wants_full_scan  # noqa: E402
+from _shadow import UNATTRIBUTED, ShadowEvaluator  # noqa: E402
 
 # Set up Guardrails environment
 os.environ.setdefault('GUARDRAILS_ENABLE_METRICS', 'true')
 os.environ.setdefault('GUARDRAILS_ENABLE_REMOTE_INFERENCING', 'true')
 
 # Import Guardrails
+import_started_at = time.perf_counter()
 try:
-    from guardrails.hub import DetectPII  # type: ignore
+    # Pinned copy from the prebuilt bundle when there is one, else the hub;
+    # its remote inference calls share the pooled inference client
+    HubDetectPII = import_hub_validator("DetectPII")
+    DetectPII = pooled_hub_validator(HubDetectPII)
+    # The shadow worker's copy uses its own client, off the live connections
+    ShadowDetectPII = pooled_hub_validator(HubDetectPII, SHADOW_INFERENCE_CLIENT)
     import guardrails as gd  # type: ignore
+    from guardrails.errors import ValidationError as GuardrailsValidationError  # type: ignore
     GUARDRAILS_AVAILABLE = True
     print("[Guardrails] Successfully imported Guardrails AI 0.4.2")
 except ImportError as e:
     print(f"[Guardrails] Import error: {e}")
     GUARDRAILS_AVAILABLE = False
+record_startup("guardrails_import", import_started_at)
+
+# Fields accepted when starting a profiling session
+PROFILE_OPTIONS = ("mode", "seconds", "requests", "interval_ms", "top", "include_idle")
+
+# Trips to the regex fallback while Guardrails keeps timing out or failing
+GUARDRAILS_BREAKER = CircuitBreaker()
+
+# Bounds concurrent validations; past the queue, requests are shed with 503
+ADMISSION = AdmissionController("python-validate")
 
 class handler(BaseHTTPRequestHandler):
     def _set_cors_headers(self):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
+        self.send_header("Access-Control-Allow-Headers", f"Content-Type, Authorization, {ADMIN_TOKEN_HEADER}, {PRIORITY_HEADER}")
         self.send_header("Cache-Control", "no-cache")
     
+    def _send_json(self, status, body, headers=None):
+        payload = dumps(body)
+        self.send_response(status)
+        self.send_header("Content-type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self._set_cors_headers()
+        self.end_headers()
+        self.wfile.write(payload)
+
     def do_OPTIONS(self):
         self.send_response(200)
         self._set_cors_headers()
         self.end_headers()
     
+    def _admin_query(self):
+        """Query params of an ?admin=profile request, or None for ordinary traffic."""
+        query = parse_qs(urlsplit(self.path).query)
+        if query.get("admin") != ["profile"]:
+            return None
+        return {name: values[-1] for name, values in query.items()}
+
+    def _handle_profile(self, query):
+        """Admin-only profiling: POST starts a session, GET fetches it, DELETE ends it early."""
+        if not admin_authorized(self.headers.get(ADMIN_TOKEN_HEADER)):
+            self._send_json(403, {"error": "Forbidden"})
+            return
+
+        if self.command == "POST":
+            try:
+                length = parse_content_length(self.headers.get("Content-Length"))
+                options = loads(read_body(self.rfile, length)) if length else {}
+                status = PROFILER.start(**{name: options[name] for name in PROFILE_OPTIONS if name in options})
+            except ProfilerBusy as e:
+                self._send_json(409, {"error": str(e)})
+                return
+            except (ValueError, TypeError) as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            self._send_json(202, status)
+            return
+
+        if self.command == "DELETE":
+            PROFILER.stop()
+        status = PROFILER.status()
+        if query.get("format") == "collapsed" and "collapsed" in status:
+            # Plain text for flamegraph.pl / speedscope
+            payload = "\n".join(status["collapsed"]).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            self._set_cors_headers()
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+        self._send_json(200, status)
+
+    def do_DELETE(self):
+        query = self._admin_query()
+        if query is None:
+            self._send_json(405, {"error": "Method not allowed"})
+            return
+        self._handle_profile(query)
+
     def do_GET(self):
+        query = self._admin_query()
+        if query is not None:
+            self._handle_profile(query)
+            return
+
         # Add a health check endpoint
-        self.send_response(200)
-        self.send_header("Content-type", "application/json")
-        self._set_cors_headers()
-        self.end_headers()
         health_response = {
             "status": "healthy",
             "service": "Guardrails DLP Validation",
-            "guardrails_available": GUARDRAILS_AVAILABLE
+            "guardrails_available": GUARDRAILS_AVAILABLE,
+            "inference_url": INFERENCE_URL,
+            "json_codec": CODEC_NAME,
+            "guardrails_circuit": GUARDRAILS_BREAKER.snapshot(),
+            "admission": ADMISSION.snapshot(),
+            "inference_client": INFERENCE_CLIENT.snapshot(),
+            "shadow": SHADOW.snapshot(),
+            "validator_costs": (REMOTE_SCHEDULER if INFERENCE_URL else GUARDRAILS_SCHEDULER).snapshot()
         }
-        self.wfile.write(json.dumps(health_response).encode("utf-8"))
+        self._send_json(200, health_response)
     
     def do_POST(self):
-        content_length = int(self.headers.get("Content-Length", 0))
+        started_at = time.monotonic()
+        query = self._admin_query()
+        if query is not None:
+            self._handle_profile(query)
+            return
+
+        try:
+            with ADMISSION.admit(parse_priority(self.headers.get(PRIORITY_HEADER))):
+                self._validate(started_at)
+        except Overloaded as e:
+            # Shed before reading the body; drop the connection rather than drain it
+            print(f"[Admission] Shed request: {e.reason}")
+            self.close_connection = True
+            self._send_json(503, {"error": str(e), "reason": e.reason},
+                            headers={"Retry-After": str(e.retry_after_s)})
+
+    def _validate(self, started_at):
+        try:
+            # Enforce the size limit before allocating anything for the body
+            content_length = parse_content_length(self.headers.get("Content-Length"))
+        except PayloadTooLarge as e:
+            self.close_connection = True
+            self._send_json(413, {"error": str(e)})
+            return
+
         if content_length == 0:
-            self.send_response(400)
-            self.send_header("Content-type", "application/json")
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "No data received"}).encode("utf-8"))
+            self._send_json(400, {"error": "No data received"})
             return
 
-        post_data = self.rfile.read(content_length)
+        post_data = read_body(self.rfile, content_length)
         
         try:
-            data = json.loads(post_data.decode("utf-8"))
+            data = loads(post_data)
+            del post_data
             text = data.get("text", "")
             enabled_validators = data.get("enabled_validators", [])
+            include_original_text = data.get("include_original_text", True) is not False
+            deadline = request_deadline(data.get("latency_budget_ms"), started_at)
+            # "audit" callers want every violation; chat stops at the first block
+            full_scan = wants_full_scan(data.get("mode", "chat"))
             
             if not text:
-                self.send_response(400)
-                self.send_header("Content-type", "application/json")
-                self._set_cors_headers()
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "No text provided"}).encode("utf-8"))
+                self._send_json(400, {"error": "No text provided"})
                 return
 
-            print(f"[Guardrails Python] Validating text: '{text}'")
+            print(f"[Guardrails Python] Validating text ({len(text)} chars)")
             print(f"[Guardrails Python] Enabled validators: {enabled_validators}")
             print(f"[Guardrails Python] Guardrails available: {GUARDRAILS_AVAILABLE}")
 
-            if not GUARDRAILS_AVAILABLE:
+            validation_started_at = time.monotonic()
+            if INFERENCE_URL:
+                # Dedicated inference endpoint (e.g. the local load-test stand-in)
+                primary = lambda: validate_with_remote_inference(text, enabled_validators, full_scan)
+            elif GUARDRAILS_AVAILABLE:
+                primary = lambda: validate_with_guardrails(text, enabled_validators, full_scan)
+            else:
+                primary = None
+
+            if primary is None:
                 # Fallback response if Guardrails is not available
                 print("[Guardrails Python] Using fallback validation patterns...")
                 result = validate_with_fallback_patterns(text, enabled_validators)
+                result["degraded"] = False
             else:
-                result = validate_with_guardrails(text, enabled_validators)
+                result = validate_with_deadline(
+                    primary,
+                    lambda: validate_with_fallback_patterns(text, enabled_validators),
+                    deadline,
+                    GUARDRAILS_BREAKER
+                )
 
-            print(f"[Guardrails Python] Validation result: {result}")
+            print(f"[Guardrails Python] Validation result: passed={result['passed']}, degraded={result['degraded']}, violations={result['violations']}")
 
-            self.send_response(200)
-            self.send_header("Content-type", "application/json")
-            self._set_cors_headers()
-            self.end_headers()
-            self.wfile.write(json.dumps(result).encode("utf-8"))
+            live_ms = (time.monotonic() - validation_started_at) * 1000
+            self._send_json(200, shape_response(result, include_original_text))
+            if PROFILER.active:
+                PROFILER.note_request()
+            # After the response is written; sampling is a queue put at most
+            SHADOW.offer(text, enabled_validators, result, live_ms)
 
         except Exception as e:
             print(f"[Guardrails Python] Error: {e}")
             import traceback
             traceback.print_exc()
             
-            self.send_response(500)
-            self.send_header("Content-type", "application/json")
-            self._set_cors_headers()
-            self.end_headers()
             error_response = {
                 "error": "Validation failed",
                 "passed": False,
@@ -106,231 +257,148 @@ class handler(BaseHTTPRequestHandler):
                     "severity": "high"
                 }]
             }
-            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+            self._send_json(500, error_response)
 
-def validate_with_fallback_patterns(text, enabled_validators):
+def guardrails_pii_found(text, entities, validator=None):
     """
-    Fallback validation using regex patterns when Guardrails AI is not available
+    True when DetectPII (or the given DetectPII class) finds any of entities
+    in text. Engine errors (hub, remote inference) raise, so the deadline
+    wrapper degrades and counts them against the circuit breaker instead of
+    reporting a block.
     """
-    violations = []
-    should_block = False
-    
-    print(f"[Fallback] Validating text with fallback patterns: {enabled_validators}")
-    
-    # PII Detection fallback patterns
-    if "PII Detection" in enabled_validators:
-        pii_patterns = [
-            (r'\b[A-Z][a-z]{2,}\s+[A-Z][a-z]{2,}(?:\s+[A-Z][a-z]{2,})?\b', "Personal name detected"),  # More specific name pattern (3+ chars each)
-            (r'\b\d{1,5}\s+[A-Za-z\s]+(?:street|st|avenue|ave|road|rd|drive|dr|lane|ln|terrace|way|place|pl|boulevard|blvd)\b', "Street address detected"),  # Address pattern
-            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email address detected"),  # Email pattern
-            (r'\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b', "Phone number detected"),  # Phone pattern
-        ]
-        
-        # Skip common greeting words that aren't names
-        common_greetings = [
-            "hello world", "good morning", "good afternoon", "good evening", "thank you",
-            "what is the weather", "how are you", "nice to meet", "see you later",
-            "have a good", "take care", "best regards", "kind regards"
-        ]
-        text_lower = text.lower()
-        
-        # Don't flag common greetings as names
-        is_common_greeting = any(greeting in text_lower for greeting in common_greetings)
-        
-        for pattern, message in pii_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                # Additional check for name pattern to avoid false positives
-                if "Personal name detected" in message and is_common_greeting:
-                    print(f"[Fallback] Skipping name detection for common greeting")
-                    continue
-                    
-                print(f"[Fallback] PII pattern matched: {message}")
-                violations.append({
-                    "type": "PII Detection",
-                    "message": "Personal identifiable information detected",
-                    "severity": "high"
-                })
-                should_block = True
-                break  # Stop at first match
-    
-    # Financial & Medical Data fallback patterns
-    if "Financial & Medical Data" in enabled_validators:
-        financial_patterns = [
-            (r'\b\d{3}-\d{2}-\d{4}\b', "SSN pattern detected"),  # SSN pattern
-            (r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b', "Credit card pattern detected"),  # Credit card pattern
-        ]
-        
-        for pattern, message in financial_patterns:
-            if re.search(pattern, text):
-                print(f"[Fallback] Financial pattern matched: {message}")
-                violations.append({
-                    "type": "Sensitive Data",
-                    "message": "Sensitive financial or medical information detected",
-                    "severity": "high"
-                })
-                should_block = True
-                break
-    
-    # API Keys & Secrets fallback patterns
-    if "API Keys & Secrets" in enabled_validators:
-        secret_patterns = [
-            (r'(?:api[_-]?key|secret[_-]?key|access[_-]?token)[\s:=]+[A-Za-z0-9+/]{20,}', "API key pattern detected"),  # API key pattern
-            (r'[A-Za-z0-9+/]{40,}={0,2}', "Base64 encoded secret pattern detected"),  # Base64 pattern
-        ]
-        
-        for pattern, message in secret_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                print(f"[Fallback] Secret pattern matched: {message}")
-                violations.append({
-                    "type": "Code Secrets",
-                    "message": "API keys or secrets detected",
-                    "severity": "high"
-                })
-                should_block = True
-                break
-    
-    print(f"[Fallback] Validation complete. Should block: {should_block}, Violations: {len(violations)}")
-    
+    guard = gd.Guard().use(validator or DetectPII, pii_entities=entities, on_fail="exception")
+    try:
+        guard.parse(llm_output=text)
+        return False
+    except GuardrailsValidationError as validation_error:
+        print(f"[Guardrails] DetectPII validation failed: {validation_error}")
+        return True
+
+def guardrails_pii(text):
+    """PII Detection - only run if specifically enabled"""
+    print("[Guardrails] Running PII validation...")
+    if not guardrails_pii_found(text, ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER"]):
+        print("[Guardrails] PII validation result: passed=True")
+        return []
+    print("[Guardrails] PII validation result: passed=False")
+    return [{
+        "type": "PII Detection",
+        "message": "Personal identifiable information detected",
+        "severity": "high"
+    }]
+
+def guardrails_sensitive_data(text):
+    """Financial & Medical Data Detection - separate from PII, focuses on financial/medical data"""
+    print("[Guardrails] Running sensitive data validation...")
+    if not guardrails_pii_found(text, ["US_SSN", "CREDIT_DEBIT_CARD_NUMBER", "MEDICAL_LICENSE"]):
+        print("[Guardrails] Sensitive data validation result: passed=True")
+        return []
+    print("[Guardrails] Sensitive data validation result: passed=False")
+    return [{
+        "type": "Sensitive Data",
+        "message": "Sensitive financial or medical information detected",
+        "severity": "high"
+    }]
+
+def guardrails_secrets(text):
+    """API Keys & Secrets Detection using Guardrails DetectSecrets validator"""
+    print("[Guardrails] Running secrets validation...")
+    DetectSecrets = import_hub_validator("DetectSecrets", "guardrails.validators")
+    result = DetectSecrets().validate(text, {})
+    print(f"[Guardrails] Secrets validation result: {result}")
+
+    # Check if validation passed
+    if hasattr(result, 'outcome') and result.outcome == 'pass':
+        return []
+    return [{
+        "type": "Code Secrets",
+        "message": "API keys or secrets detected",
+        "severity": "high"
+    }]
+
+def local_check(check, violation_on_error):
+    """Wrap a local check so an unexpected error blocks instead of failing the request"""
+    def run(text):
+        try:
+            violation = check(text)
+            return [violation] if violation else []
+        except Exception as e:
+            print(f"[Guardrails] {violation_on_error['type']} check error: {e}")
+            return [dict(violation_on_error)]
+    return run
+
+def competitor_mentions(text):
+    print("[Guardrails] Competitor Mentions validation - temporarily disabled (requires setup)")
+    return []
+
+# Validator name -> fn(text) returning a list of violations (empty when the text passes)
+GUARDRAILS_VALIDATORS = {
+    "PII Detection": guardrails_pii,
+    "Financial & Medical Data": guardrails_sensitive_data,
+    "API Keys & Secrets": guardrails_secrets,
+    # Local validators, no inference needed
+    "Confidential Documents": local_check(check_confidential_documents, {
+        "type": "Confidential Document",
+        "message": "Text from a protected internal document detected",
+        "severity": "high"
+    }),
+    "Toxic Language": local_check(check_toxicity, {
+        "type": "Toxic Language",
+        "message": "Toxic or abusive language detected",
+        "severity": "high"
+    }),
+    "Profanity Filter": local_check(check_profanity, {
+        "type": "Profanity",
+        "message": "Profane language detected",
+        "severity": "medium"
+    }),
+    "Competitor Mentions": competitor_mentions,
+}
+
+# Learns per-validator cost and hit rate to order chat-path runs
+GUARDRAILS_SCHEDULER = ValidatorScheduler("guardrails")
+
+def validate_with_guardrails(text, enabled_validators, full_scan=False):
+    """
+    Use actual Guardrails AI 0.4.2 to validate the text. Unless full_scan is
+    set, validators run cheapest-per-block first and stop at the first block.
+    """
+    print(f"[Guardrails] Starting validation with validators: {enabled_validators}")
+
+    # Validator errors propagate: the deadline wrapper answers from the
+    # fallback and the circuit breaker counts the failure
+    validators = [
+        (name, validator) for name, validator in GUARDRAILS_VALIDATORS.items()
+        if name in enabled_validators
+    ]
+    violations, skipped = GUARDRAILS_SCHEDULER.run(validators, text, stop_on_block=not full_scan)
+
     return {
-        "passed": not should_block,
+        "passed": not violations,
         "original_text": text,
         "sanitized_text": None,
-        "violations": violations
+        "violations": violations,
+        "skipped_validators": skipped
     }
 
-def validate_with_guardrails(text, enabled_validators):
-    """
-    Use actual Guardrails AI 0.4.2 to validate the text
-    """
-    violations = []
-    should_block = False
+def guardrails_detect_entities(text, entities):
+    """Shadow detector: DetectPII with a candidate entity list."""
+    # DetectPII reports a failure, not which entities matched
+    return [UNATTRIBUTED] if guardrails_pii_found(text, entities, ShadowDetectPII) else []
 
-    try:
-        print(f"[Guardrails] Starting validation with validators: {enabled_validators}")
-        
-        # PII Detection - only run if specifically enabled
-        if "PII Detection" in enabled_validators:
-            try:
-                print("[Guardrails] Creating PII filter...")
-                # Create Guard with DetectPII validator
-                guard = gd.Guard().use(DetectPII, pii_entities=["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER"], on_fail="exception")
-                
-                print("[Guardrails] Running PII validation...")
-                try:
-                    result = guard.parse(llm_output=text)
-                    print(f"[Guardrails] PII validation result: passed=True")
-                    # If parse succeeds without exception, no PII was detected
-                except Exception as validation_error:
-                    print(f"[Guardrails] PII validation result: passed=False - {validation_error}")
-                    violations.append({
-                        "type": "PII Detection",
-                        "message": "Personal identifiable information detected",
-                        "severity": "high"
-                    })
-                    should_block = True
-                
-            except Exception as e:
-                print(f"[Guardrails] PII validation error: {e}")
-                violations.append({
-                    "type": "PII Detection",
-                    "message": "Personal identifiable information detected",
-                    "severity": "high"
-                })
-                should_block = True
-        
-        # Financial & Medical Data Detection - separate from PII, focuses on financial/medical data
-        if "Financial & Medical Data" in enabled_validators:
-            try:
-                print("[Guardrails] Creating sensitive data filter...")
-                # Create Guard with DetectPII validator for sensitive financial/medical data
-                guard = gd.Guard().use(DetectPII, pii_entities=["US_SSN", "CREDIT_DEBIT_CARD_NUMBER", "MEDICAL_LICENSE"], on_fail="exception")
-                
-                print("[Guardrails] Running sensitive data validation...")
-                try:
-                    result = guard.parse(llm_output=text)
-                    print(f"[Guardrails] Sensitive data validation result: passed=True")
-                    # If parse succeeds without exception, no sensitive data was detected
-                except Exception as validation_error:
-                    print(f"[Guardrails] Sensitive data validation result: passed=False - {validation_error}")
-                    violations.append({
-                        "type": "Sensitive Data",
-                        "message": "Sensitive financial or medical information detected",
-                        "severity": "high"
-                    })
-                    should_block = True
-                
-            except Exception as e:
-                print(f"[Guardrails] Sensitive data validation error: {e}")
-                violations.append({
-                    "type": "Sensitive Data", 
-                    "message": "Sensitive financial or medical information detected",
-                    "severity": "high"
-                })
-                should_block = True
+if INFERENCE_URL:
+    shadow_detector = lambda text, entities: [
+        found.get("type") for found in detect_entities(text, entities, client=SHADOW_INFERENCE_CLIENT)]
+elif GUARDRAILS_AVAILABLE:
+    shadow_detector = guardrails_detect_entities
+else:
+    shadow_detector = None
 
-        # API Keys & Secrets Detection using Guardrails DetectSecrets validator
-        if "API Keys & Secrets" in enabled_validators:
-            try:
-                print("[Guardrails] Creating secrets detection filter...")
-                from guardrails.validators import DetectSecrets  # type: ignore
-                secrets_filter = DetectSecrets()
-                
-                print("[Guardrails] Running secrets validation...")
-                result = secrets_filter.validate(text, {})
-                print(f"[Guardrails] Secrets validation result: {result}")
-                
-                # Check if validation passed
-                if hasattr(result, 'outcome') and result.outcome == 'pass':
-                    print(f"[Guardrails] Secrets validation result: passed=True")
-                else:
-                    print(f"[Guardrails] Secrets validation result: passed=False")
-                    violations.append({
-                        "type": "Code Secrets",
-                        "message": "API keys or secrets detected",
-                        "severity": "high"
-                    })
-                    should_block = True
-                
-            except Exception as e:
-                print(f"[Guardrails] Code secrets validation error: {e}")
-                violations.append({
-                    "type": "Code Secrets",
-                    "message": "API keys or secrets detected",
-                    "severity": "high"
-                })
-                should_block = True
-
-        # Toxic Language Detection
-        if "Toxic Language" in enabled_validators:
-            print("[Guardrails] Toxic Language validation - temporarily disabled (requires setup)")
-
-        # Profanity Filter
-        if "Profanity Filter" in enabled_validators:
-            print("[Guardrails] Profanity Filter validation - temporarily disabled (requires setup)")
-
-        # Competitor Mentions Detection
-        if "Competitor Mentions" in enabled_validators:
-            print("[Guardrails] Competitor Mentions validation - temporarily disabled (requires setup)")
-
-        return {
-            "passed": not should_block,
-            "original_text": text,
-            "sanitized_text": None,
-            "violations": violations
-        }
+# Trials a candidate entity policy on sampled traffic, off the request path
+SHADOW = ShadowEvaluator("python-validate", shadow_detector, helper_cpu=SHADOW_INFERENCE_CLIENT.cpu_time)
 
-    except Exception as e:
-        print(f"[Guardrails] General validation error: {e}")
-        import traceback
-        traceback.print_exc()
-        
-        return {
-            "passed": False,
-            "original_text": text,
-            "sanitized_text": None,
-            "violations": [{
-                "type": "System Error",
-                "message": f"Guardrails validation error: {str(e)}",
-                "severity": "high"
-            }]
-        } 
\ No newline at end of file
+# With a prebuilt bundle, pay for lazy model loads at startup, not on the first request
+if BUNDLE is not None:
+    warm_up_started_at = time.perf_counter()
+    warm_up(GUARDRAILS_VALIDATORS if GUARDRAILS_AVAILABLE and not INFERENCE_URL else FALLBACK_VALIDATORS)
+    record_startup("warm_up", warm_up_started_at)
@@ -1,45 +1,69 @@
 #!/usr/bin/env python3
 """
-Setup script to install Guardrails validators
-This should be run during the build process
+Build step: install the Guardrails hub validators and write the prebuilt
+validator bundle (see _bundle.py) that workers load at startup.
+
+Any failure exits non-zero so a broken build stops the deploy instead of
+surfacing as hub resolution errors on live requests. Installing from the
+hub needs a Guardrails hub token in GUARDRAILS_TOKEN; the build never
+prompts for one.
+
+Usage: python setup.py [--out bundle/] [--skip-install] [--local-only]
 """
 
+import argparse
+import os
 import subprocess
 import sys
-import os
+
+# Build from installed packages, never from a previous bundle
+os.environ["HAIVEN_VALIDATOR_BUNDLE"] = "off"
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from _bundle import DEFAULT_BUNDLE_DIR, HUB_VALIDATORS, build_bundle  # noqa: E402
+
+
+def run_guardrails(*args):
+    # No stdin: a command that wants to prompt fails instead of hanging the build
+    result = subprocess.run([sys.executable, "-m", "guardrails", *args], capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL)
+    if result.returncode != 0:
+        print(result.stdout)
+        print(result.stderr, file=sys.stderr)
+        raise SystemExit(f"guardrails {' '.join(args)} failed with exit code {result.returncode}")
+
 
 def install_validators():
     """Install required Guardrails validators from the Hub"""
-    
-    # Set up Guardrails configuration
+    token = os.environ.get("GUARDRAILS_TOKEN")
+    if not token:
+        raise SystemExit("GUARDRAILS_TOKEN is not set; it is needed to install hub validators "
+                         "(or pass --skip-install / --local-only)")
     print("Configuring Guardrails...")
-    try:
-        # Configure Guardrails with default settings
-        subprocess.run([
-            sys.executable, "-m", "guardrails", "configure",
-            "--enable-metrics", "--enable-remote-inferencing"
-        ], check=True, capture_output=True, text=True)
-        print("Guardrails configured successfully")
-    except subprocess.CalledProcessError as e:
-        print(f"Warning: Guardrails configuration failed: {e}")
-        print("Continuing with validator installation...")
-
-    # Install required validators
-    validators = [
-        "hub://guardrails/detect_pii",
-        "hub://guardrails/detect_secrets"
-    ]
-    
-    for validator in validators:
+    run_guardrails("configure", "--token", token, "--enable-metrics", "--enable-remote-inferencing")
+    print("Guardrails configured successfully")
+
+    for validator in HUB_VALIDATORS.values():
         print(f"Installing validator: {validator}")
-        try:
-            subprocess.run([
-                sys.executable, "-m", "guardrails", "hub", "install", validator, "--quiet"
-            ], check=True, capture_output=True, text=True)
-            print(f"Successfully installed: {validator}")
-        except subprocess.CalledProcessError as e:
-            print(f"Failed to install {validator}: {e}")
-            # Continue with other validators
+        run_guardrails("hub", "install", validator, "--quiet")
+        print(f"Successfully installed: {validator}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Install hub validators and build the validator bundle")
+    parser.add_argument("--out", default=DEFAULT_BUNDLE_DIR, help="bundle directory to write")
+    parser.add_argument("--skip-install", action="store_true", help="bundle the validators already installed")
+    parser.add_argument("--local-only", action="store_true",
+                        help="no hub validators, e.g. for deployments using HAIVEN_INFERENCE_URL")
+    args = parser.parse_args()
+
+    if args.local_only:
+        build_bundle(args.out, hub_validators={})
+        return
+    if not args.skip_install:
+        install_validators()
+    build_bundle(args.out)
+
 
 if __name__ == "__main__":
-    install_validators() 
\ No newline at end of file
+    main()
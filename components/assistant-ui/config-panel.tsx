@@ -48,6 +48,14 @@ const DEFAULT_VALIDATORS: ValidatorConfig[] = [
       "Prevents exposure of API keys, passwords, and authentication tokens",
     category: "data-protection",
   },
+  {
+    id: "confidential-documents",
+    name: "Confidential Documents",
+    enabled: false,
+    type: "privacy",
+    description: "Blocks passages copied from protected internal documents",
+    category: "data-protection",
+  },
 
   // Content Safety
   {
@@ -0,0 +1,96 @@
+// Checksum-verified card, SSN and IBAN detection for the chat route's
+// last-resort fallback. It is a small port of api/python-validate/_numeric_ids.py:
+// a number only counts if it passes its checksum, so order numbers, timestamps
+// and invoice IDs stop blocking chat while the validation service is down.
+
+// Digit groups joined by single spaces or hyphens, not glued to a word or decimal
+const NUMBER = /(?<![\w.])\d+(?:[ -]\d+)*(?![\w]|\.\d)/g;
+const IBAN = /(?<![A-Za-z0-9])[A-Z]{2}\d{2}(?: ?[A-Z0-9]){11,32}/g;
+
+// Country code -> IBAN length, for the countries most often pasted into chat
+const IBAN_LENGTHS: Record<string, number> = {
+  AT: 20, BE: 16, CH: 21, DE: 22, DK: 18, ES: 24, FI: 18, FR: 27,
+  GB: 22, IE: 22, IT: 27, LU: 20, NL: 18, NO: 15, PL: 28, PT: 25, SE: 24,
+};
+
+// Published in advertising, so never a real person's SSN
+const INVALID_SSNS = new Set(["078051120", "219099999"]);
+
+export function luhnValid(digits: string): boolean {
+  let total = 0;
+  for (let i = 0; i < digits.length; i++) {
+    let d = digits.charCodeAt(digits.length - 1 - i) - 48;
+    if (i & 1) {
+      d *= 2;
+      if (d > 9) d -= 9;
+    }
+    total += d;
+  }
+  return total % 10 === 0;
+}
+
+function cardPrefixValid(digits: string): boolean {
+  const length = digits.length;
+  const p2 = Number(digits.slice(0, 2));
+  const p3 = Number(digits.slice(0, 3));
+  const p4 = Number(digits.slice(0, 4));
+  if (digits[0] === "4" && [13, 16, 19].includes(length)) return true; // Visa
+  if (length === 16 && ((p2 >= 51 && p2 <= 55) || (p4 >= 2221 && p4 <= 2720))) return true; // Mastercard
+  if (length === 15 && (p2 === 34 || p2 === 37)) return true; // Amex
+  if (length >= 14 && ([36, 38, 39].includes(p2) || (p3 >= 300 && p3 <= 305))) return true; // Diners
+  return (
+    length >= 16 &&
+    (p4 === 6011 || p2 === 65 || (p3 >= 644 && p3 <= 649) || // Discover
+      (p4 >= 3528 && p4 <= 3589) || // JCB
+      p2 === 62) // UnionPay
+  );
+}
+
+export function cardValid(digits: string): boolean {
+  return digits.length >= 13 && digits.length <= 19 && cardPrefixValid(digits) && luhnValid(digits);
+}
+
+export function ssnValid(digits: string): boolean {
+  const area = Number(digits.slice(0, 3));
+  const group = Number(digits.slice(3, 5));
+  const serial = Number(digits.slice(5));
+  if (digits.length !== 9 || INVALID_SSNS.has(digits)) return false;
+  return area > 0 && area < 900 && area !== 666 && group > 0 && serial > 0;
+}
+
+export function ibanValid(iban: string): boolean {
+  if (IBAN_LENGTHS[iban.slice(0, 2)] !== iban.length) return false;
+  const rearranged = iban.slice(4) + iban.slice(0, 4);
+  let remainder = 0;
+  for (const ch of rearranged) {
+    const value = parseInt(ch, 36);
+    remainder = (value > 9 ? remainder * 100 + value : remainder * 10 + value) % 97;
+  }
+  return remainder === 1;
+}
+
+function tokenHasIdentifier(token: string): boolean {
+  const groups = token.split(/[ -]/);
+  if (groups.length === 1) return cardValid(token);
+  const lengths = groups.map((group) => group.length).join(",");
+  const digits = groups.join("");
+  if (lengths === "3,2,4") return ssnValid(digits);
+  // Printed card groupings: 4-4-4-4(-1..3), 4-4-4-1..3 and Amex/Diners 4-6-5 / 4-6-4
+  if (/^4(,4){2,3}(,[1-4])?$/.test(lengths) || lengths === "4,6,5" || lengths === "4,6,4") {
+    return cardValid(digits);
+  }
+  return groups.some((group) => group.length >= 13 && cardValid(group));
+}
+
+// True when text contains a card number, SSN or IBAN that passes its checksum
+export function hasVerifiedNumericIdentifier(text: string): boolean {
+  for (const match of text.matchAll(NUMBER)) {
+    if (match[0].length >= 11 && tokenHasIdentifier(match[0])) return true;
+  }
+  for (const match of text.matchAll(IBAN)) {
+    const compact = match[0].replace(/ /g, "");
+    const length = IBAN_LENGTHS[compact.slice(0, 2)];
+    if (length && compact.length >= length && ibanValid(compact.slice(0, length))) return true;
+  }
+  return false;
+}
@@ -0,0 +1,122 @@
+import net from "node:net";
+
+// Client for python-api's Unix domain socket transport (python-api/uds_server.py).
+// Frames are a 4-byte big-endian length, a 1-byte codec ("j" = JSON) and the
+// payload. Requests are pipelined over one shared connection and matched to
+// responses by id, so concurrent chat requests don't queue behind each other.
+
+const HEADER_BYTES = 5;
+const CODEC_JSON = "j".charCodeAt(0);
+
+export interface UdsValidationOptions {
+  mode?: "chat" | "audit";
+  latency_budget_ms?: number;
+  include_original_text?: boolean;
+  // Admission class; the HTTP endpoints take it as the X-Haiven-Priority header
+  priority?: "interactive" | "batch";
+}
+
+// Response shape shared by the socket and the HTTP validate endpoints
+export interface ValidationServiceResult {
+  passed: boolean;
+  original_text?: string;
+  sanitized_text?: string | null;
+  violations?: Array<{ type: string; message: string; severity: string }>;
+  degraded?: boolean;
+  degraded_reason?: string;
+  error?: string;
+  status?: number;
+  retry_after?: number;
+}
+
+type PendingRequest = {
+  resolve: (value: ValidationServiceResult) => void;
+  reject: (reason: Error) => void;
+};
+
+class UdsValidationClient {
+  private socket: net.Socket | null = null;
+  private buffer = Buffer.alloc(0);
+  private nextId = 1;
+  private pending = new Map<number, PendingRequest>();
+
+  constructor(private readonly path: string) {}
+
+  private connect(): net.Socket {
+    if (this.socket) return this.socket;
+
+    const socket = net.createConnection(this.path);
+    socket.on("data", (chunk: Buffer) => this.onData(chunk));
+    socket.on("error", (error) => this.failAll(error));
+    socket.on("close", () =>
+      this.failAll(new Error("Validation socket closed"))
+    );
+    this.socket = socket;
+    return socket;
+  }
+
+  private onData(chunk: Buffer) {
+    this.buffer =
+      this.buffer.length === 0 ? chunk : Buffer.concat([this.buffer, chunk]);
+
+    while (this.buffer.length >= HEADER_BYTES) {
+      const length = this.buffer.readUInt32BE(0);
+      if (this.buffer.length < HEADER_BYTES + length) break;
+
+      const payload = this.buffer.subarray(HEADER_BYTES, HEADER_BYTES + length);
+      this.buffer = this.buffer.subarray(HEADER_BYTES + length);
+
+      const message = JSON.parse(payload.toString("utf-8"));
+      const request = this.pending.get(message.id);
+      if (request) {
+        this.pending.delete(message.id);
+        request.resolve(message);
+      }
+    }
+  }
+
+  private failAll(error: Error) {
+    this.socket?.destroy();
+    this.socket = null;
+    this.buffer = Buffer.alloc(0);
+    for (const request of this.pending.values()) request.reject(error);
+    this.pending.clear();
+  }
+
+  validate(
+    text: string,
+    enabledValidators: string[],
+    options: UdsValidationOptions = {}
+  ): Promise<ValidationServiceResult> {
+    const id = this.nextId++;
+    const payload = Buffer.from(
+      JSON.stringify({
+        id,
+        text,
+        enabled_validators: enabledValidators,
+        ...options,
+      }),
+      "utf-8"
+    );
+    const header = Buffer.alloc(HEADER_BYTES);
+    header.writeUInt32BE(payload.length, 0);
+    header.writeUInt8(CODEC_JSON, 4);
+
+    return new Promise((resolve, reject) => {
+      this.pending.set(id, { resolve, reject });
+      this.connect().write(Buffer.concat([header, payload]));
+    });
+  }
+}
+
+const clients = new Map<string, UdsValidationClient>();
+
+// One long-lived client per socket path, shared across requests
+export function getUdsValidationClient(path: string): UdsValidationClient {
+  let client = clients.get(path);
+  if (!client) {
+    client = new UdsValidationClient(path);
+    clients.set(path, client);
+  }
+  return client;
+}
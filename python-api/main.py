@@ -1,10 +1,36 @@
 #!/usr/bin/env python3
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import List, Optional
 import logging
+import os
+import sys
+import time
+
+# Shared helpers (codec, validators) live with the serverless function
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _admission import PRIORITY_HEADER, AdmissionController, Overloaded, parse_priority  # noqa: E402
+from _bundle import BUNDLE, warm_up  # noqa: E402
+from _codec import CODEC_NAME, MAX_BODY_BYTES, PayloadTooLarge, dumps, loads, parse_content_length  # noqa: E402
+from _deadline import CircuitBreaker, request_deadline, validate_with_deadline_async  # noqa: E402
+from _fallback import FALLBACK_VALIDATORS, validate_with_fallback_patterns  # noqa: E402
+from _fingerprint import check_confidential_documents  # noqa: E402
+from _profiler import ADMIN_TOKEN_HEADER, PROFILER, ProfilerBusy, admin_authorized, record_startup  # noqa: E402
+from _profanity import check_profanity  # noqa: E402
+from _toxicity import check_toxicity  # noqa: E402
+from _remote import (  # noqa: E402
+    INFERENCE_CLIENT,
+    INFERENCE_URL,
+    REMOTE_SCHEDULER,
+    SHADOW_INFERENCE_CLIENT,
+    detect_entities,
+    validate_with_remote_inference,
+)
+from _scheduler import ValidatorScheduler, wants_full_scan  # noqa: E402
+from _shadow import UNATTRIBUTED, ShadowEvaluator  # noqa: E402
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +48,7 @@ app.add_middleware(
 )
 
 # Import Guardrails
+import_started_at = time.perf_counter()
 try:
     from guardrails import Guard
     from guardrails.validators import PIIFilter, DetectSecrets
@@ -30,10 +57,36 @@ try:
 except ImportError as e:
     GUARDRAILS_AVAILABLE = False
     logger.error(f"Failed to import Guardrails: {e}")
+record_startup("guardrails_import", import_started_at)
+
+# Trips to the regex fallback while Guardrails keeps timing out or failing
+GUARDRAILS_BREAKER = CircuitBreaker()
+
+# Bounds concurrent validations (HTTP and Unix socket); past the queue, requests are shed with 503
+ADMISSION = AdmissionController("python-api")
+
+# This service's validator names mapped onto the shared (index.py) validator names
+SHARED_VALIDATOR_NAMES = {
+    "PII Detection": ["PII Detection", "Financial & Medical Data"],
+    "Sensitive Data": ["PII Detection", "Financial & Medical Data"],
+    "Code Secrets": ["API Keys & Secrets"],
+}
 
 class ValidationRequest(BaseModel):
     text: str
     enabled_validators: List[str]
+    include_original_text: bool = True
+    latency_budget_ms: Optional[float] = None
+    # "chat" stops at the first blocking violation; "audit" runs every validator
+    mode: str = "chat"
+
+class ProfileRequest(BaseModel):
+    mode: str = "cpu"
+    seconds: Optional[float] = None
+    requests: Optional[int] = None
+    interval_ms: Optional[float] = None
+    top: int = 30
+    include_idle: bool = False
 
 class Violation(BaseModel):
     type: str
@@ -42,111 +95,311 @@ class Violation(BaseModel):
 
 class ValidationResponse(BaseModel):
     passed: bool
-    original_text: str
+    original_text: Optional[str] = None
     sanitized_text: Optional[str] = None
     violations: List[Violation] = []
     error: Optional[str] = None
+    degraded: bool = False
+    degraded_reason: Optional[str] = None
+    skipped_validators: List[str] = []
 
 @app.get("/")
 async def root():
     return {
         "message": "Guardrails DLP API",
         "version": "1.0.0",
-        "guardrails_available": GUARDRAILS_AVAILABLE
+        "guardrails_available": GUARDRAILS_AVAILABLE,
+        "json_codec": CODEC_NAME
     }
 
 @app.get("/health")
 async def health():
     return {
         "status": "healthy",
-        "guardrails_available": GUARDRAILS_AVAILABLE
+        "guardrails_available": GUARDRAILS_AVAILABLE,
+        "inference_url": INFERENCE_URL,
+        "guardrails_circuit": GUARDRAILS_BREAKER.snapshot(),
+        "admission": ADMISSION.snapshot(),
+        "inference_client": INFERENCE_CLIENT.snapshot(),
+        "shadow": SHADOW.snapshot(),
+        "validator_costs": (REMOTE_SCHEDULER if INFERENCE_URL else GUARDRAILS_SCHEDULER).snapshot()
     }
 
+def require_admin(token: Optional[str]):
+    if not admin_authorized(token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+@app.post("/admin/profile", status_code=202)
+async def start_profile(
+    request: Optional[ProfileRequest] = None,
+    token: Optional[str] = Header(None, alias=ADMIN_TOKEN_HEADER)
+):
+    """Start a CPU or allocation profiling session (admin only)"""
+    require_admin(token)
+    try:
+        return PROFILER.start(**(request or ProfileRequest()).model_dump())
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/admin/profile")
+async def get_profile(
+    format: str = "json",
+    token: Optional[str] = Header(None, alias=ADMIN_TOKEN_HEADER)
+):
+    """Session status, or its report once finished; format=collapsed returns plain-text stacks"""
+    require_admin(token)
+    status = PROFILER.status()
+    if format == "collapsed" and "collapsed" in status:
+        return Response(content="\n".join(status["collapsed"]), media_type="text/plain")
+    return status
+
+@app.delete("/admin/profile")
+async def stop_profile(token: Optional[str] = Header(None, alias=ADMIN_TOKEN_HEADER)):
+    """End the running session early; fetch the report with GET"""
+    require_admin(token)
+    PROFILER.stop()
+    return PROFILER.status()
+
+async def read_body(http_request: Request) -> bytearray:
+    """Read the request body into one buffer, enforcing the size limit up front."""
+    length = parse_content_length(http_request.headers.get("content-length"))
+    body = bytearray(length)
+    received = 0
+    async for chunk in http_request.stream():
+        end = received + len(chunk)
+        if end > MAX_BODY_BYTES:
+            raise PayloadTooLarge(end)
+        if end <= length:
+            body[received:end] = chunk
+        else:
+            # Content-Length was missing or understated; grow the buffer
+            del body[received:]
+            body += chunk
+        received = end
+    del body[received:]
+    return body
+
+def json_response(response: ValidationResponse, include_original_text: bool, status_code: int = 200) -> Response:
+    exclude = None if include_original_text else {"original_text"}
+    return Response(
+        content=dumps(response.model_dump(exclude=exclude)),
+        status_code=status_code,
+        media_type="application/json"
+    )
+
 @app.post("/validate", response_model=ValidationResponse)
-async def validate_text(request: ValidationRequest):
+async def validate_text(http_request: Request):
     """Validate text using Guardrails AI validators"""
-    
-    if not GUARDRAILS_AVAILABLE:
-        return ValidationResponse(
-            passed=True,
-            original_text=request.text,
-            violations=[],
-            error="Guardrails not available"
-        )
-    
-    logger.info(f"Validating text: '{request.text}'")
-    logger.info(f"Enabled validators: {request.enabled_validators}")
-    
-    violations = []
-    should_block = False
-    
+    started_at = time.monotonic()
+
     try:
-        # PII Detection
-        if "PII Detection" in request.enabled_validators or "Sensitive Data" in request.enabled_validators:
-            try:
-                logger.info("Running PII validation...")
-                pii_guard = Guard()
-                pii_guard.use(PIIFilter(pii_entities=["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "SSN", "CREDIT_CARD"]))
-                
-                pii_result = pii_guard.validate(request.text)
-                logger.info(f"PII validation result: passed={pii_result.validation_passed}")
-                
-                if not pii_result.validation_passed:
-                    violations.append(Violation(
-                        type="PII Detection",
-                        message="Personal identifiable information detected",
-                        severity="high"
-                    ))
-                    should_block = True
-                    
-            except Exception as e:
-                logger.error(f"PII validation error: {e}")
-                violations.append(Violation(
-                    type="PII Detection",
-                    message=f"PII validation error: {str(e)}",
-                    severity="high"
-                ))
-                should_block = True
-        
-        # Code Secrets Detection
-        if "Code Secrets" in request.enabled_validators:
+        async with ADMISSION.admit_async(parse_priority(http_request.headers.get(PRIORITY_HEADER))):
             try:
-                logger.info("Running secrets validation...")
-                secrets_guard = Guard()
-                secrets_guard.use(DetectSecrets())
-                
-                secrets_result = secrets_guard.validate(request.text)
-                logger.info(f"Secrets validation result: passed={secrets_result.validation_passed}")
-                
-                if not secrets_result.validation_passed:
-                    violations.append(Violation(
-                        type="Code Secrets",
-                        message="API keys or secrets detected",
-                        severity="high"
-                    ))
-                    should_block = True
-                    
-            except Exception as e:
-                logger.error(f"Secrets validation error: {e}")
-                violations.append(Violation(
-                    type="Code Secrets",
-                    message=f"Secrets validation error: {str(e)}",
-                    severity="high"
-                ))
-                should_block = True
-        
-        return ValidationResponse(
-            passed=not should_block,
-            original_text=request.text,
-            violations=violations
-        )
-        
-    except Exception as e:
-        logger.error(f"General validation error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Validation failed: {str(e)}"
+                request = ValidationRequest.model_validate(loads(await read_body(http_request)))
+            except PayloadTooLarge as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail=e.errors())
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+
+            return json_response(await run_validation(request, started_at), request.include_original_text)
+    except Overloaded as e:
+        logger.warning(f"Shed validate request: {e.reason}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after_s)})
+
+async def run_validation(request: ValidationRequest, started_at: float) -> ValidationResponse:
+    """Validator core shared by the HTTP endpoint and the Unix socket transport"""
+    logger.info(f"Validating text ({len(request.text)} chars)")
+    logger.info(f"Enabled validators: {request.enabled_validators}")
+
+    full_scan = wants_full_scan(request.mode)
+    validation_started_at = time.monotonic()
+    if INFERENCE_URL:
+        # Dedicated inference endpoint (e.g. the local load-test stand-in)
+        primary = lambda: validate_with_remote_inference(request.text, to_shared_names(request.enabled_validators), full_scan)
+    elif GUARDRAILS_AVAILABLE:
+        primary = lambda: validate_with_guardrails(request.text, request.enabled_validators, full_scan)
+    else:
+        primary = None
+
+    if primary is None:
+        # No detection engine at all: the fallback patterns are the only check
+        result = validate_with_fallback(request.text, request.enabled_validators)
+        result["degraded"] = True
+        result["degraded_reason"] = "no_engine"
+    else:
+        # Validators run off the event loop; past the deadline we answer from the fallback
+        result = await validate_with_deadline_async(
+            primary,
+            lambda: validate_with_fallback(request.text, request.enabled_validators),
+            request_deadline(request.latency_budget_ms, started_at),
+            GUARDRAILS_BREAKER
         )
+    if result["degraded"]:
+        logger.warning(f"Answered from fallback patterns: {result['degraded_reason']}")
+    if PROFILER.active:
+        PROFILER.note_request()
+    live_ms = (time.monotonic() - validation_started_at) * 1000
+    response = ValidationResponse(**result)
+    # Sampling is a queue put at most; the candidate policy runs on the shadow worker
+    SHADOW.offer(
+        request.text,
+        to_shared_names(request.enabled_validators),
+        dict(
+            result,
+            violations=[v.model_dump() if isinstance(v, BaseModel) else v for v in result["violations"]],
+            skipped_validators=to_shared_names(result.get("skipped_validators") or []),
+        ),
+        live_ms,
+    )
+
+    return response
+
+def guardrails_pii(text: str) -> List[Violation]:
+    # Engine errors raise, so the deadline wrapper degrades and the circuit breaker counts them
+    logger.info("Running PII validation...")
+    pii_guard = Guard()
+    pii_guard.use(PIIFilter(pii_entities=["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER", "SSN", "CREDIT_CARD"]))
+
+    pii_result = pii_guard.validate(text)
+    logger.info(f"PII validation result: passed={pii_result.validation_passed}")
+
+    if not pii_result.validation_passed:
+        return [Violation(
+            type="PII Detection",
+            message="Personal identifiable information detected",
+            severity="high"
+        )]
+    return []
+
+def guardrails_secrets(text: str) -> List[Violation]:
+    logger.info("Running secrets validation...")
+    secrets_guard = Guard()
+    secrets_guard.use(DetectSecrets())
+
+    secrets_result = secrets_guard.validate(text)
+    logger.info(f"Secrets validation result: passed={secrets_result.validation_passed}")
+
+    if not secrets_result.validation_passed:
+        return [Violation(
+            type="Code Secrets",
+            message="API keys or secrets detected",
+            severity="high"
+        )]
+    return []
+
+def local_check(check, violation_type: str):
+    """Wrap a local check so an unexpected error blocks instead of failing the request"""
+    def run(text: str) -> List[Violation]:
+        try:
+            violation = check(text)
+            return [Violation(**violation)] if violation else []
+        except Exception as e:
+            logger.error(f"{violation_type} check error: {e}")
+            return [Violation(
+                type=violation_type,
+                message=f"{violation_type} check error: {str(e)}",
+                severity="high"
+            )]
+    return run
+
+# Validator name -> fn(text) returning a list of violations (empty when the text passes).
+# "PII Detection" and "Sensitive Data" share one PIIFilter check, which runs once.
+# The shared names (index.py, the chat config panel) are accepted too, since
+# the chat route sends those over the Unix socket.
+GUARDRAILS_VALIDATORS = {
+    "PII Detection": guardrails_pii,
+    "Sensitive Data": guardrails_pii,
+    "Financial & Medical Data": guardrails_pii,
+    "Code Secrets": guardrails_secrets,
+    "API Keys & Secrets": guardrails_secrets,
+    "Confidential Documents": local_check(check_confidential_documents, "Confidential Document"),
+    "Toxic Language": local_check(check_toxicity, "Toxic Language"),
+    "Profanity Filter": local_check(check_profanity, "Profanity"),
+}
+
+# A validator list must mean the same here as on index.py and the fallback path
+_unhandled_names = set(FALLBACK_VALIDATORS) - set(GUARDRAILS_VALIDATORS)
+if _unhandled_names:
+    raise RuntimeError(f"Shared validator names without a Guardrails check: {sorted(_unhandled_names)}")
+
+# Learns per-validator cost and hit rate to order chat-path runs
+GUARDRAILS_SCHEDULER = ValidatorScheduler("guardrails")
+
+def validate_with_guardrails(text: str, enabled_validators: List[str], full_scan: bool = False) -> dict:
+    """
+    Run the enabled Guardrails validators; blocking, so call it off the event loop.
+    Unless full_scan is set, validators run cheapest-per-block first and stop at the first block.
+    """
+    validators = [
+        (name, validator) for name, validator in GUARDRAILS_VALIDATORS.items()
+        if name in enabled_validators
+    ]
+    violations, skipped = GUARDRAILS_SCHEDULER.run(validators, text, stop_on_block=not full_scan)
+
+    return {
+        "passed": not violations,
+        "original_text": text,
+        "violations": violations,
+        "skipped_validators": skipped
+    }
+
+def to_shared_names(enabled_validators: List[str]) -> List[str]:
+    shared_names = []
+    for name in enabled_validators:
+        for shared_name in SHARED_VALIDATOR_NAMES.get(name, [name]):
+            if shared_name not in shared_names:
+                shared_names.append(shared_name)
+    return shared_names
+
+def validate_with_fallback(text: str, enabled_validators: List[str]) -> dict:
+    """Regex fallback, translating this service's validator names"""
+    return validate_with_fallback_patterns(text, to_shared_names(enabled_validators))
+
+def guardrails_detect_entities(text: str, entities: List[str]) -> List[str]:
+    """Shadow detector: PIIFilter with a candidate entity list"""
+    result = Guard().use(PIIFilter(pii_entities=entities)).validate(text)
+    # PIIFilter reports a failure, not which entities matched
+    return [] if result.validation_passed else [UNATTRIBUTED]
+
+if INFERENCE_URL:
+    shadow_detector = lambda text, entities: [
+        found.get("type") for found in detect_entities(text, entities, client=SHADOW_INFERENCE_CLIENT)]
+elif GUARDRAILS_AVAILABLE:
+    shadow_detector = guardrails_detect_entities
+else:
+    shadow_detector = None
+
+# Trials a candidate entity policy on sampled traffic, off the request path
+SHADOW = ShadowEvaluator("python-api", shadow_detector, helper_cpu=SHADOW_INFERENCE_CLIENT.cpu_time)
+
+@app.on_event("startup")
+async def warm_up_validators():
+    # With a prebuilt bundle, pay for lazy model loads before taking traffic
+    if BUNDLE is not None and GUARDRAILS_AVAILABLE:
+        started_at = time.perf_counter()
+        warm_up(GUARDRAILS_VALIDATORS)
+        record_startup("warm_up", started_at)
+
+# Optional Unix socket transport for sidecar deployments (see uds_server.py)
+UDS_PATH = os.environ.get("HAIVEN_UDS_PATH")
+
+@app.on_event("startup")
+async def start_uds_transport():
+    if UDS_PATH:
+        from uds_server import make_validation_handler, start_server
+        handle = make_validation_handler(ValidationRequest, run_validation, ADMISSION)
+        app.state.uds_server = await start_server(handle, UDS_PATH)
+
+@app.on_event("shutdown")
+async def stop_uds_transport():
+    server = getattr(app.state, "uds_server", None)
+    if server is not None:
+        server.close()
+        await server.wait_closed()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,105 @@
+"""
+Client helper for the Unix domain socket transport (see uds_server.py).
+
+    async with UdsValidationClient("/tmp/haiven-validate.sock") as client:
+        results = await asyncio.gather(*(client.validate(text, ["PII Detection"]) for text in texts))
+
+All calls on one client share a single connection and are pipelined; each
+resolves when its own response arrives, whatever the order.
+"""
+
+import asyncio
+import itertools
+import socket
+
+from uds_protocol import DEFAULT_SOCKET_PATH, HEADER, ProtocolError, decode_payload, default_codec, encode_frame, read_frame
+
+
+class UdsValidationClient:
+    def __init__(self, path=DEFAULT_SOCKET_PATH, codec=None):
+        self.path = path
+        self.codec = codec or default_codec()
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._reader = None
+        self._writer = None
+        self._reader_task = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._reader_task = asyncio.create_task(self._read_responses())
+        return self
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _read_responses(self):
+        error = ConnectionError("UDS connection closed")
+        try:
+            while True:
+                frame = await read_frame(self._reader)
+                if frame is None:
+                    break
+                message, _ = frame
+                future = self._pending.pop(message.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (ProtocolError, ConnectionError, ValueError) as e:
+            error = e
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def validate(self, text, enabled_validators, **options):
+        """
+        Validate one text. options are passed through as request fields
+        (mode, latency_budget_ms, include_original_text). Returns the
+        response map; bad requests come back with "error" and "status".
+        """
+        if self._writer is None:
+            await self.connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message = {"id": request_id, "text": text, "enabled_validators": list(enabled_validators)}
+        message.update(options)
+        self._writer.write(encode_frame(message, self.codec))
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+
+
+def validate_once(text, enabled_validators, path=DEFAULT_SOCKET_PATH, timeout=30.0, **options):
+    """Blocking one-shot helper for scripts: one connection, one request."""
+    message = {"id": 1, "text": text, "enabled_validators": list(enabled_validators)}
+    message.update(options)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(encode_frame(message))
+        header = _recv_exactly(sock, HEADER.size)
+        length, codec = HEADER.unpack(header)
+        return decode_payload(_recv_exactly(sock, length), codec)
+
+
+def _recv_exactly(sock, size):
+    buf = bytearray(size)
+    view = memoryview(buf)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError("UDS connection closed mid-frame")
+        received += n
+    return buf
@@ -0,0 +1,92 @@
+"""
+Framing for the Unix domain socket transport.
+
+Every message, in either direction, is one frame:
+
+    +----------------------+-----------+------------------+
+    | length (uint32, BE)  | codec (1) | payload (length) |
+    +----------------------+-----------+------------------+
+
+codec is b"m" for msgpack or b"j" for UTF-8 JSON. A server always answers
+in the codec the request used, so clients without msgpack (e.g. Node) can
+speak JSON over the same socket. Requests carry a client-chosen "id" that
+is echoed in the response; responses may come back out of order, which is
+what allows many requests in flight on one connection.
+
+Request:  {"id": 1, "text": "...", "enabled_validators": [...],
+           "mode": "chat", "latency_budget_ms": 2000, "priority": "batch"}
+Response: {"id": 1, "passed": true, "violations": [...], ...}
+          {"id": 1, "error": "...", "status": 400} on a bad request
+          {"id": 1, "error": "...", "status": 503, "retry_after": 2} when shed
+"""
+
+import asyncio
+import os
+import struct
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _codec import MAX_BODY_BYTES, PayloadTooLarge  # noqa: E402
+from _codec import dumps as json_dumps  # noqa: E402
+from _codec import loads as json_loads  # noqa: E402
+
+try:
+    import msgpack  # type: ignore
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+HEADER = struct.Struct(">IB")
+CODEC_MSGPACK = ord("m")
+CODEC_JSON = ord("j")
+DEFAULT_SOCKET_PATH = os.environ.get("HAIVEN_UDS_PATH", "/tmp/haiven-validate.sock")
+
+
+class ProtocolError(ValueError):
+    """Raised for frames that cannot be decoded; the connection cannot be resynced."""
+
+
+def default_codec():
+    return CODEC_MSGPACK if MSGPACK_AVAILABLE else CODEC_JSON
+
+
+def encode_frame(message, codec=None):
+    codec = codec or default_codec()
+    if codec == CODEC_MSGPACK:
+        payload = msgpack.packb(message, use_bin_type=True)
+    else:
+        payload = json_dumps(message)
+    return HEADER.pack(len(payload), codec) + payload
+
+
+def decode_payload(payload, codec):
+    if codec == CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise ProtocolError("msgpack frame received but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False)
+    if codec == CODEC_JSON:
+        return json_loads(payload)
+    raise ProtocolError(f"Unknown codec byte {codec!r}")
+
+
+async def read_frame(reader, limit=MAX_BODY_BYTES):
+    """
+    Read one frame from an asyncio StreamReader. Returns (message, codec), or
+    None on a clean EOF between frames. The length is checked against the
+    limit before the payload is read.
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial:
+            return None
+        raise ProtocolError("Connection closed mid-frame") from e
+    length, codec = HEADER.unpack(header)
+    if length > limit:
+        raise PayloadTooLarge(length, limit)
+    try:
+        payload = await reader.readexactly(length)
+    except asyncio.IncompleteReadError as e:
+        raise ProtocolError("Connection closed mid-frame") from e
+    return decode_payload(payload, codec), codec
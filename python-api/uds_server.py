@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Unix domain socket transport for the Guardrails DLP API.
+
+For sidecar deployments next to the Next.js app: length-prefixed msgpack
+(or JSON) frames over a local socket instead of HTTP, with many requests
+in flight per connection and responses returned as soon as each finishes.
+Requests go through the same run_validation core as POST /validate, and
+original_text is not echoed unless a request asks for it.
+
+Serve it from the API process by starting main.py with HAIVEN_UDS_PATH set
+(single worker only, since the socket path can only be bound once), or on
+its own with:
+
+    python uds_server.py --path /tmp/haiven-validate.sock
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import stat
+import time
+
+from uds_protocol import DEFAULT_SOCKET_PATH, PayloadTooLarge, ProtocolError, encode_frame, read_frame
+
+# uds_protocol puts the shared helpers on sys.path
+from _admission import Overloaded, parse_priority  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# Per-connection cap; past it we stop reading frames until a response goes out
+MAX_IN_FLIGHT = int(os.environ.get("HAIVEN_UDS_MAX_IN_FLIGHT", "64"))
+
+
+def make_validation_handler(request_model, run_validation, admission=None):
+    """
+    Adapt main.py's run_validation to a dict-in, dict-out frame handler. With
+    an AdmissionController, requests share its limits with the HTTP endpoint
+    and carry their class in a "priority" field instead of a header.
+    """
+    async def validate(message, started_at):
+        message.setdefault("include_original_text", False)
+        try:
+            request = request_model.model_validate(message)
+        except ValueError as e:
+            return {"error": str(e), "status": 422}
+        response = await run_validation(request, started_at)
+        exclude = None if request.include_original_text else {"original_text"}
+        return response.model_dump(exclude=exclude)
+
+    async def handle(message):
+        started_at = time.monotonic()
+        if admission is None:
+            return await validate(message, started_at)
+        try:
+            async with admission.admit_async(parse_priority(message.pop("priority", None))):
+                return await validate(message, started_at)
+        except Overloaded as e:
+            return {"error": str(e), "status": 503, "retry_after": e.retry_after_s}
+    return handle
+
+
+async def handle_connection(reader, writer, handle):
+    in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+    tasks = set()
+
+    async def respond(message, codec):
+        try:
+            reply = await handle(message)
+        except Exception as e:
+            logger.error(f"UDS request failed: {e}")
+            reply = {"error": f"Validation failed: {str(e)}", "status": 500}
+        reply["id"] = message.get("id")
+        try:
+            writer.write(encode_frame(reply, codec))
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            in_flight.release()
+
+    try:
+        while True:
+            frame = await read_frame(reader)
+            if frame is None:
+                break
+            message, codec = frame
+            if not isinstance(message, dict):
+                writer.write(encode_frame({"id": None, "error": "Request must be a map", "status": 400}, codec))
+                continue
+            await in_flight.acquire()
+            task = asyncio.create_task(respond(message, codec))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (ProtocolError, PayloadTooLarge) as e:
+        # Framing is lost after a bad frame, so report it and drop the connection
+        logger.warning(f"Closing UDS connection: {e}")
+        try:
+            writer.write(encode_frame({"id": None, "error": str(e), "status": 400}))
+        except ConnectionError:
+            pass
+    except ConnectionError:
+        pass
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def start_server(handle, path=DEFAULT_SOCKET_PATH):
+    """Bind the socket (replacing a stale one) and start accepting connections."""
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.unlink(path)
+    server = await asyncio.start_unix_server(
+        lambda reader, writer: handle_connection(reader, writer, handle),
+        path=path
+    )
+    # Only processes in the deployment's user/group may connect
+    os.chmod(path, 0o660)
+    logger.info(f"UDS transport listening on {path}")
+    return server
+
+
+async def serve_forever(path):
+    import main as service
+    handle = make_validation_handler(service.ValidationRequest, service.run_validation, service.ADMISSION)
+    server = await start_server(handle, path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the validator core over a Unix domain socket")
+    parser.add_argument("--path", default=DEFAULT_SOCKET_PATH)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve_forever(args.path))
+    except KeyboardInterrupt:
+        pass
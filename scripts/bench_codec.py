@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark the request/response JSON path of the validation services.
+
+Compares the legacy path (decode body to str, json.loads, echo original_text,
+json.dumps(...).encode) with the current one (read into one buffer, codec
+loads from bytes, no echo, codec dumps to bytes). For each payload size it
+reports time per request and the bytes allocated while handling a request,
+measured with tracemalloc, which is what we copy on top of the socket buffer.
+
+Usage: python scripts/bench_codec.py [iterations]
+"""
+
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _codec import CODEC_NAME, dumps, loads, read_body, shape_response  # noqa: E402
+
+SIZES = [1024, 64 * 1024, 512 * 1024]
+
+
+def make_body(size):
+    text = ("The quarterly numbers look fine, nothing sensitive here. " * (size // 56 + 1))[:size]
+    return json.dumps({"text": text, "enabled_validators": ["PII Detection"]}).encode("utf-8")
+
+
+def make_result(text):
+    return {"passed": True, "original_text": text, "sanitized_text": None, "violations": []}
+
+
+def legacy_path(body):
+    rfile = io.BytesIO(body)
+    post_data = rfile.read(len(body))
+    data = json.loads(post_data.decode("utf-8"))
+    result = make_result(data["text"])
+    return json.dumps(result).encode("utf-8")
+
+
+def current_path(body):
+    rfile = io.BytesIO(body)
+    post_data = read_body(rfile, len(body))
+    data = loads(post_data)
+    del post_data
+    result = shape_response(make_result(data["text"]), include_original_text=False)
+    return dumps(result)
+
+
+def measure_bytes(fn, body):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    out = fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak - base, len(out)
+
+
+def measure_time(fn, body, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(body)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"JSON codec: {CODEC_NAME}, iterations: {iterations}")
+    print(f"{'payload':>10} {'path':>8} {'us/req':>10} {'alloc bytes':>12} {'x payload':>10} {'resp bytes':>11}")
+    for size in SIZES:
+        body = make_body(size)
+        for name, fn in (("legacy", legacy_path), ("current", current_path)):
+            copied, response_size = measure_bytes(fn, body)
+            per_request = measure_time(fn, body, iterations)
+            print(f"{len(body):>10} {name:>8} {per_request * 1e6:>10.1f} {copied:>12} "
+                  f"{copied / len(body):>10.2f} {response_size:>11}")
+
+
+if __name__ == "__main__":
+    main()
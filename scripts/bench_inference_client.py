@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Per-call urllib requests vs the pooled, batching inference client, against
+the local stand-in from scripts/mock_inference_server.py (started in-process).
+
+Worker threads play concurrent validate requests, each making one detect
+call per message. Both variants report throughput, latency percentiles and
+what the endpoint saw: calls, batches and TCP connections opened.
+
+Usage: python scripts/bench_inference_client.py [--threads 32] [--messages 2000]
+           [--latency-ms 20] [--error-rate 0.02] [--max-concurrency 8]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _inference_client import InferenceClient, InferenceError  # noqa: E402
+from mock_inference_server import MockConfig, make_handler  # noqa: E402
+
+ENTITIES = ["PERSON", "EMAIL_ADDRESS", "PHONE_NUMBER"]
+TEXT = "Hi, my name is John Smith, reach me at john.smith@example.com or 555-123-4567"
+
+
+def urllib_detect(url, text, entities, timeout):
+    """What _remote.detect_entities did before: one request and one connection per call."""
+    body = json.dumps({"inputs": [{"text": text, "entities": entities}]}).encode("utf-8")
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())["results"][0]["entities"]
+
+
+class ConnectionCounter(ThreadingHTTPServer):
+    daemon_threads = True
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def start_mock(args):
+    mock_args = argparse.Namespace(
+        latency_dist="const", latency_ms=args.latency_ms, latency_sigma=0.5, per_item_ms=args.per_item_ms,
+        error_rate=args.error_rate, error_status=503, hang_rate=0.0, hang_ms=0.0,
+        max_concurrency=args.server_slots, seed=7)
+    config = MockConfig(mock_args)
+    server = ConnectionCounter(("127.0.0.1", 0), make_handler(config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config
+
+
+def run(label, detect, args):
+    server, config = start_mock(args)
+    url = f"http://127.0.0.1:{server.server_port}/v1/detect"
+    latencies, errors = [], 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors
+        started_at = time.perf_counter()
+        try:
+            detect(url, TEXT, ENTITIES, 10.0)
+            ok = True
+        except (InferenceError, OSError):
+            ok = False
+        with lock:
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            errors += not ok
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(one, range(args.messages)))
+    elapsed = time.perf_counter() - started_at
+    server.shutdown()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{label:<10}{args.messages / elapsed:>9.0f}{statistics.median(latencies):>9.1f}{p99:>9.1f}"
+          f"{errors:>8}{config.stats['requests']:>8}{config.stats['max_batch']:>8}{server.connections:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-call urllib vs the pooled inference client")
+    parser.add_argument("--threads", type=int, default=32, help="concurrent callers")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--server-slots", type=int, default=0, help="mock server inference slots, 0 for unlimited")
+    parser.add_argument("--max-concurrency", type=int, default=8, help="client cap on in-flight calls")
+    args = parser.parse_args()
+
+    client = InferenceClient(max_concurrency=args.max_concurrency)
+    print(f"{'':<10}{'msg/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'errors':>8}{'calls':>8}{'batch':>8}{'conns':>8}")
+    run("urllib", urllib_detect, args)
+    run("pooled", client.detect, args)
+    print(f"client: {json.dumps(client.snapshot())}")
+
+
+if __name__ == "__main__":
+    main()
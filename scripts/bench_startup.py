@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Startup and first-request latency of api/python-validate/index.py, with and
+without the prebuilt validator bundle.
+
+Each run is a fresh interpreter (a cold worker): it imports index.py, serves
+it on a loopback port and times the first and second validate requests.
+"runtime" disables the bundle (HAIVEN_VALIDATOR_BUNDLE=off) so validators
+and models are resolved lazily as before; "bundle" loads the bundle from
+--bundle, as produced by api/python-validate/setup.py.
+
+Usage:
+    python api/python-validate/setup.py --skip-install   # or --local-only
+    python scripts/bench_startup.py --runs 10
+"""
+
+import argparse
+import http.client
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import HTTPServer
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+INDEX_PATH = os.path.join(ROOT, "api", "python-validate", "index.py")
+DEFAULT_BUNDLE = os.path.join(ROOT, "api", "python-validate", "bundle")
+
+REQUEST = {
+    "text": "My name is John Smith and my email is john.smith@example.com",
+    "enabled_validators": ["PII Detection", "Financial & Medical Data", "API Keys & Secrets",
+                           "Toxic Language", "Profanity Filter", "Confidential Documents"],
+    "mode": "audit",
+}
+
+
+def child():
+    """Runs inside the fresh interpreter; prints one JSON line of timings."""
+    started_at = time.perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        spec = importlib.util.spec_from_file_location("python_validate_index", INDEX_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        import_ms = (time.perf_counter() - started_at) * 1000
+
+        module.handler.log_message = lambda self, format, *a: None
+        server = HTTPServer(("127.0.0.1", 0), module.handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        body = json.dumps(REQUEST)
+        timings = []
+        for _ in range(2):
+            conn = http.client.HTTPConnection("127.0.0.1", server.server_port)
+            request_started_at = time.perf_counter()
+            conn.request("POST", "/", body=body, headers={"Content-Type": "application/json"})
+            conn.getresponse().read()
+            timings.append((time.perf_counter() - request_started_at) * 1000)
+            conn.close()
+        server.shutdown()
+
+    print(json.dumps({"import_ms": import_ms, "first_request_ms": timings[0], "second_request_ms": timings[1]}))
+
+
+def measure(bundle, runs):
+    env = dict(os.environ, HAIVEN_VALIDATOR_BUNDLE=bundle)
+    samples = []
+    for _ in range(runs):
+        started_at = time.perf_counter()
+        output = subprocess.run([sys.executable, __file__, "--child"], env=env, capture_output=True, text=True, check=True)
+        sample = json.loads(output.stdout.strip().splitlines()[-1])
+        sample["process_ms"] = (time.perf_counter() - started_at) * 1000
+        samples.append(sample)
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start latency with and without the validator bundle")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--bundle", default=DEFAULT_BUNDLE)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+    if not os.path.exists(os.path.join(args.bundle, "manifest.json")):
+        parser.error(f"no bundle at {args.bundle}; build one with api/python-validate/setup.py")
+
+    print(f"{'':<10}{'import':>10}{'1st req':>10}{'2nd req':>10}{'process':>10}   (median ms, {args.runs} runs)")
+    for label, bundle in (("runtime", "off"), ("bundle", args.bundle)):
+        result = measure(bundle, args.runs)
+        print(f"{label:<10}{result['import_ms']:>10.1f}{result['first_request_ms']:>10.1f}"
+              f"{result['second_request_ms']:>10.1f}{result['process_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Compare HTTP and Unix domain socket transports to python-api.
+
+Sends the same validation requests over keep-alive HTTP (POST /validate)
+and over the UDS transport, first one at a time (per-call latency) and then
+with --concurrency requests in flight (throughput). Start main.py with
+HAIVEN_UDS_PATH set so both transports hit the same process.
+
+Usage:
+    HAIVEN_UDS_PATH=/tmp/haiven-validate.sock python python-api/main.py
+    python scripts/bench_transport.py --http-url http://127.0.0.1:8000/validate \\
+        --uds-path /tmp/haiven-validate.sock --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "python-api"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import DEFAULT_TEXTS, HttpClient  # noqa: E402
+from uds_client import UdsValidationClient  # noqa: E402
+
+
+def percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))] * 1000
+
+
+async def run(call, requests, concurrency):
+    """Issue requests calls with at most concurrency in flight; return (latencies, elapsed)."""
+    latencies = []
+    next_index = iter(range(requests))
+
+    async def worker():
+        for i in next_index:
+            start = time.perf_counter()
+            await call(DEFAULT_TEXTS[i % len(DEFAULT_TEXTS)])
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started
+
+
+def report(label, latencies, elapsed):
+    ordered = sorted(latencies)
+    print(
+        f"{label:<22} {len(ordered) / elapsed:>9.0f} rps"
+        f"  p50 {percentile(ordered, 50):>7.2f} ms"
+        f"  p99 {percentile(ordered, 99):>7.2f} ms"
+    )
+
+
+async def bench_http(args, validators):
+    client = HttpClient(args.http_url, timeout=30)
+
+    async def call(text):
+        body = json.dumps({"text": text, "enabled_validators": validators, "include_original_text": False})
+        status, _ = await client.post(body.encode("utf-8"))
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+
+    try:
+        await run(call, args.warmup, 1)
+        report("http sequential", *await run(call, args.requests, 1))
+        report(f"http x{args.concurrency}", *await run(call, args.requests, args.concurrency))
+    finally:
+        client.close()
+
+
+async def bench_uds(args, validators):
+    async with UdsValidationClient(args.uds_path) as client:
+        async def call(text):
+            reply = await client.validate(text, validators)
+            if "error" in reply:
+                raise RuntimeError(reply["error"])
+
+        await run(call, args.warmup, 1)
+        report("uds sequential", *await run(call, args.requests, 1))
+        report(f"uds x{args.concurrency}", *await run(call, args.requests, args.concurrency))
+
+
+async def main_async(args):
+    validators = [v.strip() for v in args.validators.split(",") if v.strip()]
+    if args.http_url:
+        await bench_http(args, validators)
+    if args.uds_path:
+        await bench_uds(args, validators)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTTP vs UDS transport to python-api")
+    parser.add_argument("--http-url", help="e.g. http://127.0.0.1:8000/validate")
+    parser.add_argument("--uds-path", help="socket path main.py was started with (HAIVEN_UDS_PATH)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--validators", default="PII Detection,Code Secrets")
+    args = parser.parse_args()
+    if not args.http_url and not args.uds_path:
+        parser.error("give --http-url, --uds-path or both")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
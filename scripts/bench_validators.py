@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for the local validators.
+
+Times each validator that runs without network access on a mix of clean and
+offending messages and reports per-call latency. Toxic Language is measured
+three ways: one text per call, one batched score_batch call, and many
+threads going through the shared micro-batcher.
+
+Usage: python scripts/bench_validators.py [iterations]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+import _fingerprint  # noqa: E402
+from _fallback import validate_with_fallback_patterns  # noqa: E402
+from _profanity import check_profanity  # noqa: E402
+from _toxicity import MODEL, NUMPY_AVAILABLE, _batcher, score_toxicity  # noqa: E402
+
+MESSAGES = [
+    "Can you summarise the attached meeting notes for me?",
+    "My name is John Smith and my email is john.smith@example.com",
+    "My SSN is 123-45-6789, can you fill in the tax form?",
+    "Here is our api_key=sk1234567890abcdefghijklmnopqrstuvwxyz",
+    "You are a pathetic idiot and I hate you",
+    "This fucking build is broken again",
+    "Write a Python function that reverses a linked list " * 8,
+]
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+    }
+
+
+def time_calls(fn, iterations):
+    samples = []
+    for i in range(iterations):
+        message = MESSAGES[i % len(MESSAGES)]
+        start = time.perf_counter()
+        fn(message)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return percentiles(samples)
+
+
+def report(name, stats):
+    print(f"{name:<34} {stats['mean']:>10.1f} {stats['p50']:>10.1f} {stats['p99']:>10.1f}")
+
+
+def build_fingerprint_index(directory):
+    rng = random.Random(7)
+    vocabulary = "revenue forecast merger roadmap pricing churn customer board approval quarter".split()
+    documents = [(f"doc{i}", " ".join(rng.choice(vocabulary) for _ in range(2000))) for i in range(200)]
+    _fingerprint.add_documents(directory, documents)
+    _fingerprint.INDEX_PATH = directory
+    _fingerprint._index = None
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"iterations: {iterations}, numpy: {NUMPY_AVAILABLE}")
+    print(f"{'validator':<34} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}")
+
+    with tempfile.TemporaryDirectory() as index_dir, redirect_stdout(open(os.devnull, "w")) as quiet:
+        build_fingerprint_index(index_dir)
+        results = []
+        for name in ["PII Detection", "Financial & Medical Data", "API Keys & Secrets", "Confidential Documents"]:
+            results.append((f"{name} (local)", time_calls(lambda text: validate_with_fallback_patterns(text, [name]), iterations)))
+        results.append(("Profanity Filter", time_calls(check_profanity, iterations)))
+        results.append(("Toxic Language (1 per call)", time_calls(MODEL.score, iterations)))
+
+        batch = [MESSAGES[i % len(MESSAGES)] for i in range(64)]
+        start = time.perf_counter()
+        rounds = max(1, iterations // 64)
+        for _ in range(rounds):
+            MODEL.score_batch(batch)
+        per_item = (time.perf_counter() - start) / (rounds * 64) * 1e6
+        results.append(("Toxic Language (batch of 64)", {"mean": per_item, "p50": per_item, "p99": per_item}))
+
+        with ThreadPoolExecutor(32) as pool:
+            start = time.perf_counter()
+            list(pool.map(score_toxicity, (MESSAGES[i % len(MESSAGES)] for i in range(iterations))))
+            elapsed = time.perf_counter() - start
+        per_item = elapsed / iterations * 1e6
+        results.append(("Toxic Language (32 threads, batched)", {"mean": per_item, "p50": per_item, "p99": per_item}))
+        quiet.flush()
+
+    for name, stats in results:
+        report(name, stats)
+    print(f"micro-batcher: {_batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
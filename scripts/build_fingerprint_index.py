@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Build or extend the fingerprint index used by the "Confidential Documents" validator.
+
+Each run adds the given files (or every text file under the given directories)
+as one new index segment; existing segments are left untouched, so running it
+again with new documents is cheap. Workers pick up the new segment on their
+next manifest check.
+
+Usage:
+    python scripts/build_fingerprint_index.py ./fingerprints docs/internal/ roadmap.md
+    python scripts/build_fingerprint_index.py ./fingerprints --compact
+Then deploy with HAIVEN_FINGERPRINT_INDEX=./fingerprints
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _fingerprint import DEFAULT_K, DEFAULT_W, FingerprintIndex, add_documents, compact  # noqa: E402
+
+TEXT_EXTENSIONS = {".txt", ".md", ".rst", ".csv", ".json", ".html", ".tex"}
+
+
+def iter_documents(paths, root_names):
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, filenames in os.walk(path):
+                for filename in sorted(filenames):
+                    if os.path.splitext(filename)[1].lower() in TEXT_EXTENSIONS:
+                        yield from _read(os.path.join(dirpath, filename), root_names)
+        else:
+            yield from _read(path, root_names)
+
+
+def _read(path, root_names):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    name = os.path.relpath(path) if root_names else os.path.basename(path)
+    yield name, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the confidential document fingerprint index")
+    parser.add_argument("index", help="index directory (created if missing)")
+    parser.add_argument("paths", nargs="*", help="documents or directories of documents to protect")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help="k-gram length in normalized characters (new index only)")
+    parser.add_argument("--w", type=int, default=DEFAULT_W, help="winnowing window size (new index only)")
+    parser.add_argument("--full-paths", action="store_true", help="name documents by relative path instead of file name")
+    parser.add_argument("--compact", action="store_true", help="merge all segments into one after adding")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.paths:
+        added = add_documents(args.index, iter_documents(args.paths, args.full_paths), k=args.k, w=args.w)
+        print(f"Added {added} fingerprints in {time.perf_counter() - start:.2f}s")
+    if args.compact:
+        compact(args.index)
+        print("Compacted index into a single segment")
+
+    index = FingerprintIndex(args.index)
+    segment_bytes = sum(
+        os.path.getsize(os.path.join(args.index, name)) for name in index.manifest["segments"]
+    )
+    print(f"Index {args.index}: {len(index.manifest['documents'])} documents, {index.size} fingerprints, "
+          f"{len(index.manifest['segments'])} segments, {segment_bytes / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
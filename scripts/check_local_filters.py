@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+False-positive check for the local toxicity and profanity filters.
+
+Runs a benign corpus of developer and workplace chat (frank but not abusive:
+"this bug is stupid", "kill the process", ticket numbers, room codes) and a
+small abusive corpus through both filters, and prints how many lines of each
+are flagged. The benign lines should all pass; any that do not are listed.
+
+Usage: python scripts/check_local_filters.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate"))
+
+from _profanity import find_profanity  # noqa: E402
+from _toxicity import MODEL, TOXICITY_THRESHOLD  # noqa: E402
+
+BENIGN = [
+    "This is a stupid bug in my code, you know?",
+    "your code is garbage and useless",
+    "You are right, the old parser was useless for nested lists",
+    "Your build is broken again, can you take a look?",
+    "kill the process and restart the worker",
+    "I hate to say it but the tests are flaky",
+    "You should die-cast the prototype before the review",
+    "Can you kill -9 the stuck job? It is hogging the GPU",
+    "your PR is pretty much garbage collection tuning, right?",
+    "this error message is dumb, it hides the real cause",
+    "The old dashboard was ugly but you could read it",
+    "u up? need a second pair of eyes on the migration",
+    "you'll want to destroy the stack before re-deploying",
+    "You are going to hate the new lint rules",
+    "This API is pathetic at handling retries, you need a wrapper",
+    "Meet in Room A55 at 3pm",
+    "Tracking ref 7W4T-22 was delivered",
+    "Order 4SS-1337 ships tomorrow",
+    "Flight BA5S departs from gate 13",
+    "Set the timeout to 5h17 minutes",
+    "Calibrate sensor 5H1T-04 before the run",
+    "Use the class assertion helper in assessment.py",
+    "The Scunthorpe office sent the cocktail menu",
+    "You idiot-proofed the installer nicely",
+    "Your trash bin is full, empty it before the demo",
+    "You can safely kill the zombie processes",
+    "Why are you using this useless abstraction? Just inline it",
+    "honestly you are the best, thanks for the quick review",
+    "you really hurt performance with that change, revert it?",
+    "Don't shoot the messenger, but your deploy failed",
+    "I pricked my finger on the rack screw",
+    "He is cocky about his benchmark numbers",
+    "The farm keeps three rooster cocks and a goat",
+    "The donkey and two asses pulled the cart",
+]
+
+ABUSIVE = [
+    "you are an idiot",
+    "you are stupid and worthless",
+    "shut up you moron",
+    "fuck you",
+    "go die",
+    "I will find you and hurt you",
+    "kill yourself",
+    "you're pathetic",
+    "what a piece of shit",
+    "you useless b1tch",
+    "f*ck off",
+    "you are sh1t at this",
+    "I hate you",
+    "this fucking build again",
+    "stop being such bitches about the review",
+    "what a bunch of dickheads",
+]
+
+
+def toxic(text):
+    return MODEL.score(text) >= TOXICITY_THRESHOLD
+
+
+def report(label, check):
+    false_positives = [text for text in BENIGN if check(text)]
+    caught = sum(1 for text in ABUSIVE if check(text))
+    print(f"{label:<12} false positives {len(false_positives)}/{len(BENIGN)}   caught {caught}/{len(ABUSIVE)}")
+    for text in false_positives:
+        print(f"  flagged: {text!r}")
+
+
+def main():
+    report("toxicity", toxic)
+    report("profanity", lambda text: bool(find_profanity(text)))
+    missed = [text for text in ABUSIVE if not toxic(text) and not find_profanity(text)]
+    for text in missed:
+        print(f"  missed by both: {text!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Load generator for the validate endpoints.
+
+Drives /api/python-validate (index.py, e.g. via scripts/serve_index.py) or
+python-api/main.py's /validate with either a fixed number of concurrent
+clients (closed loop) or a fixed arrival rate (open loop). Open-loop
+latencies are measured from each request's scheduled arrival time, so a
+backed-up server shows up in the tail instead of silently slowing the
+generator down. Reports throughput, tail latency, error and degraded rates.
+
+Pair it with scripts/mock_inference_server.py and HAIVEN_INFERENCE_URL to
+find each deployment shape's saturation point without touching production.
+
+Usage:
+    # closed loop, 16 clients for 30s
+    python scripts/loadtest.py --url http://127.0.0.1:8001/ --concurrency 16 --duration 30
+    # open loop sweep to find the knee
+    python scripts/loadtest.py --url http://127.0.0.1:8000/validate --rates 10,20,50,100 --slo-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_TEXTS = [
+    "Can you summarise the attached meeting notes for me?",
+    "What is the weather like in Sydney this week?",
+    "My name is John Smith and my email is john.smith@example.com",
+    "Please call me back on (555) 123-4567 tomorrow",
+    "My SSN is 123-45-6789, can you fill in the tax form?",
+    "Card number 4111 1111 1111 1111 expires next month",
+    "Write a Python function that reverses a linked list",
+    "Here is our api_key=sk1234567890abcdefghijklmnopqrstuvwxyz",
+]
+
+
+class Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class HttpClient:
+    """Minimal HTTP/1.1 client with a keep-alive connection pool."""
+
+    def __init__(self, url, timeout):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.timeout = timeout
+        self.idle = []
+
+    async def _connect(self):
+        if self.idle:
+            return self.idle.pop()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        return Connection(reader, writer)
+
+    async def post(self, body, headers=None):
+        conn = await self._connect()
+        try:
+            status, payload, keep_alive = await asyncio.wait_for(self._roundtrip(conn, body, headers or {}), self.timeout)
+        except BaseException:
+            conn.close()
+            raise
+        if keep_alive:
+            self.idle.append(conn)
+        else:
+            conn.close()
+        return status, payload
+
+    async def _roundtrip(self, conn, body, headers):
+        head = [
+            f"POST {self.path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+        ]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        conn.writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed before response")
+        version, status = status_line.split(None, 2)[:2]
+        response_headers = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in response_headers:
+            payload = await conn.reader.readexactly(int(response_headers["content-length"]))
+            keep_alive = version == b"HTTP/1.1" and response_headers.get("connection", "").lower() != "close"
+        else:
+            payload = await conn.reader.read()
+            keep_alive = False
+        return int(status), payload, keep_alive
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+        self.idle = []
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = []
+        self.errors = {}
+        self.degraded = 0
+        self.blocked = 0
+        self.dropped = 0
+
+    def ok(self, latency, payload):
+        self.latencies.append(latency)
+        try:
+            result = json.loads(payload)
+        except ValueError:
+            return
+        if result.get("degraded"):
+            self.degraded += 1
+        if result.get("passed") is False:
+            self.blocked += 1
+
+    def error(self, kind):
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, elapsed, offered_rate=None, target_rate=None):
+        completed = len(self.latencies)
+        failed = sum(self.errors.values())
+        total = completed + failed + self.dropped
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))] * 1000, 2)
+
+        return {
+            "target_rps": target_rate,
+            "offered_rps": round(offered_rate, 2) if offered_rate else None,
+            "requests": total,
+            "throughput_rps": round(completed / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round((failed + self.dropped) / total, 4) if total else 0.0,
+            "degraded_rate": round(self.degraded / completed, 4) if completed else 0.0,
+            "blocked_rate": round(self.blocked / completed, 4) if completed else 0.0,
+            "p50_ms": pct(50),
+            "p90_ms": pct(90),
+            "p99_ms": pct(99),
+            "p999_ms": pct(99.9),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+            "errors": dict(self.errors),
+            "dropped": self.dropped,
+        }
+
+
+def build_bodies(args):
+    if args.payload_file:
+        with open(args.payload_file, "rb") as f:
+            return [line.strip() for line in f if line.strip()]
+    validators = [v.strip() for v in args.validators.split(",") if v.strip()]
+    bodies = []
+    for text in DEFAULT_TEXTS:
+        if args.text_bytes and len(text) < args.text_bytes:
+            text = (text + " ") * (args.text_bytes // (len(text) + 1) + 1)
+            text = text[:args.text_bytes]
+        request = {"text": text, "enabled_validators": validators, "include_original_text": False}
+        if args.budget_ms:
+            request["latency_budget_ms"] = args.budget_ms
+        bodies.append(json.dumps(request).encode("utf-8"))
+    return bodies
+
+
+async def issue(client, body, headers, recorder, started):
+    try:
+        status, payload = await client.post(body, headers)
+    except asyncio.TimeoutError:
+        recorder.error("timeout")
+        return
+    except (OSError, ConnectionError, asyncio.IncompleteReadError) as e:
+        recorder.error(type(e).__name__)
+        return
+    if status == 200:
+        recorder.ok(time.perf_counter() - started, payload)
+    else:
+        recorder.error(f"http_{status}")
+
+
+async def run_closed(args, bodies, headers, duration):
+    client = HttpClient(args.url, args.timeout)
+    recorder = Recorder()
+    stop_at = time.perf_counter() + duration
+
+    async def worker(seed):
+        rng = random.Random(seed)
+        while time.perf_counter() < stop_at:
+            await issue(client, rng.choice(bodies), headers, recorder, time.perf_counter())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return recorder.summary(elapsed)
+
+
+async def run_open(args, bodies, headers, rate, duration):
+    client = HttpClient(args.url, args.timeout)
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    in_flight = set()
+    start = time.perf_counter()
+    next_arrival = start
+    arrivals = 0
+
+    while next_arrival < start + duration:
+        arrivals += 1
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(in_flight) >= args.max_in_flight:
+            # The generator itself is saturated; count it rather than queueing silently
+            recorder.dropped += 1
+        else:
+            task = asyncio.create_task(issue(client, rng.choice(bodies), headers, recorder, next_arrival))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if args.arrival == "poisson":
+            next_arrival += rng.expovariate(rate)
+        else:
+            next_arrival += 1.0 / rate
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+    elapsed = time.perf_counter() - start
+    client.close()
+    # Poisson arrivals vary run to run, so compare against what was actually offered
+    return recorder.summary(elapsed, offered_rate=arrivals / duration, target_rate=rate)
+
+
+def saturated(summary, args):
+    reasons = []
+    offered = summary["offered_rps"]
+    if offered and summary["throughput_rps"] < 0.95 * offered:
+        reasons.append("throughput below offered load")
+    if args.slo_ms and summary["p99_ms"] is not None and summary["p99_ms"] > args.slo_ms:
+        reasons.append(f"p99 above {args.slo_ms}ms")
+    if summary["error_rate"] > args.max_error_rate:
+        reasons.append("error rate above limit")
+    return reasons
+
+
+def print_row(summary, label):
+    print(f"{label:>12} {summary['throughput_rps']:>9} {summary['p50_ms']!s:>9} {summary['p90_ms']!s:>9} "
+          f"{summary['p99_ms']!s:>9} {summary['p999_ms']!s:>9} {summary['error_rate']:>7.2%} {summary['degraded_rate']:>8.2%}")
+
+
+async def main_async(args):
+    bodies = build_bodies(args)
+    headers = dict(h.split(":", 1) for h in args.header)
+    headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+    if args.warmup:
+        await run_closed(args, bodies, headers, args.warmup)
+
+    print(f"{'load':>12} {'rps':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'errors':>7} {'degraded':>8}")
+    results = []
+    if args.rates:
+        knee = None
+        for rate in [float(r) for r in args.rates.split(",")]:
+            summary = await run_open(args, bodies, headers, rate, args.duration)
+            summary["saturated_by"] = saturated(summary, args)
+            results.append(summary)
+            print_row(summary, f"{rate:g} rps")
+            if summary["saturated_by"] and knee is None:
+                knee = rate
+                print(f"  saturated at {rate:g} rps: {', '.join(summary['saturated_by'])}")
+        if knee is None:
+            print("  no saturation within the tested rates")
+    elif args.rate:
+        summary = await run_open(args, bodies, headers, args.rate, args.duration)
+        results.append(summary)
+        print_row(summary, f"{args.rate:g} rps")
+    else:
+        summary = await run_closed(args, bodies, headers, args.duration)
+        summary["concurrency"] = args.concurrency
+        results.append(summary)
+        print_row(summary, f"c={args.concurrency}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"url": args.url, "results": results}, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the validate endpoints")
+    parser.add_argument("--url", default="http://127.0.0.1:8001/")
+    parser.add_argument("--concurrency", type=int, default=8, help="closed-loop clients")
+    parser.add_argument("--rate", type=float, default=None, help="open-loop arrival rate (req/s)")
+    parser.add_argument("--rates", default=None, help="comma-separated open-loop rates to sweep")
+    parser.add_argument("--arrival", choices=["poisson", "uniform"], default="poisson")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="closed-loop warmup seconds")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--validators", default="PII Detection,Financial & Medical Data,API Keys & Secrets")
+    parser.add_argument("--budget-ms", type=float, default=None, help="latency_budget_ms sent with each request")
+    parser.add_argument("--text-bytes", type=int, default=0, help="pad each message to this many bytes")
+    parser.add_argument("--payload-file", default=None, help="JSONL file of request bodies")
+    parser.add_argument("--header", action="append", default=[], help="extra header, 'Name: value'")
+    parser.add_argument("--slo-ms", type=float, default=None, help="p99 target used to call saturation")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", default=None, help="write results to this file")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main_async(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+
+if __name__ == "__main__":
+    main()
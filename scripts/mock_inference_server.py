@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the hosted Guardrails inference endpoint.
+
+Point the validation services at it with
+    HAIVEN_INFERENCE_URL=http://127.0.0.1:8100/v1/detect
+to load-test them offline. Latency, errors and capacity are tunable so the
+services can be driven into the regimes we see in production (cold models,
+remote hiccups, saturated GPUs).
+
+API:
+    POST /v1/detect  {"inputs": [{"text": "...", "entities": ["EMAIL_ADDRESS", ...]}, ...]}
+    ->               {"results": [{"entities": [{"type": "...", "start": 0, "end": 5}]}, ...]}
+    GET  /stats      request, batch and error counters
+
+Usage:
+    python scripts/mock_inference_server.py --port 8100 \\
+        --latency-dist lognormal --latency-ms 80 --latency-sigma 0.6 \\
+        --per-item-ms 2 --error-rate 0.01 --max-concurrency 8
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Cheap detectors so responses are plausible for the entities the services ask for
+ENTITY_PATTERNS = {
+    "EMAIL_ADDRESS": re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+    "PHONE_NUMBER": re.compile(r"\b(?:\+?1[-.\s]?)?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}\b"),
+    "PERSON": re.compile(r"\b(?:my name is|i am|i'm)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)", re.IGNORECASE),
+    "US_SSN": re.compile(r"\b\d{3}-\d{2}-\d{4}\b"),
+    "CREDIT_DEBIT_CARD_NUMBER": re.compile(r"\b\d{4}[\s-]?\d{4}[\s-]?\d{4}[\s-]?\d{4}\b"),
+    "MEDICAL_LICENSE": re.compile(r"\b[A-Z]{2}\d{6,8}\b"),
+}
+
+
+class MockConfig:
+    def __init__(self, args):
+        self.latency_dist = args.latency_dist
+        self.latency_ms = args.latency_ms
+        self.latency_sigma = args.latency_sigma
+        self.per_item_ms = args.per_item_ms
+        self.error_rate = args.error_rate
+        self.error_status = args.error_status
+        self.hang_rate = args.hang_rate
+        self.hang_ms = args.hang_ms
+        self.slots = threading.BoundedSemaphore(args.max_concurrency) if args.max_concurrency else None
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "items": 0, "errors": 0, "hangs": 0, "max_batch": 0}
+
+    def sample_latency_s(self, batch_size):
+        with self.rng_lock:
+            base = self.latency_ms
+            if self.latency_dist == "uniform":
+                ms = self.rng.uniform(0, 2 * base)
+            elif self.latency_dist == "exp":
+                ms = self.rng.expovariate(1.0 / base) if base > 0 else 0.0
+            elif self.latency_dist == "lognormal":
+                # Median of latency_ms, tail controlled by sigma
+                ms = self.rng.lognormvariate(math.log(base), self.latency_sigma) if base > 0 else 0.0
+            else:
+                ms = base
+            roll = self.rng.random()
+        ms += self.per_item_ms * batch_size
+        return ms / 1000.0, roll
+
+    def count(self, **increments):
+        with self.stats_lock:
+            for key, value in increments.items():
+                if key == "max_batch":
+                    self.stats[key] = max(self.stats[key], value)
+                else:
+                    self.stats[key] += value
+
+
+def detect(text, entities):
+    found = []
+    for entity in entities:
+        pattern = ENTITY_PATTERNS.get(entity)
+        if pattern is None:
+            continue
+        for match in pattern.finditer(text):
+            found.append({"type": entity, "start": match.start(), "end": match.end()})
+    return found
+
+
+def make_handler(config):
+    class MockInferenceHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; with Nagle on, keep-alive
+        # clients would stall on delayed ACKs
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path.startswith("/stats"):
+                with config.stats_lock:
+                    self._send_json(200, dict(config.stats))
+            else:
+                self._send_json(200, {"status": "healthy", "service": "mock inference"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                inputs = json.loads(self.rfile.read(length))["inputs"]
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"Bad request: {e}"})
+                return
+
+            config.count(requests=1, items=len(inputs), max_batch=len(inputs))
+            delay, roll = config.sample_latency_s(len(inputs))
+
+            hang = roll < config.hang_rate
+            fail = not hang and roll < config.hang_rate + config.error_rate
+
+            if config.slots:
+                config.slots.acquire()
+            try:
+                if hang:
+                    config.count(hangs=1)
+                    delay = config.hang_ms / 1000.0
+                time.sleep(delay)
+            finally:
+                if config.slots:
+                    config.slots.release()
+
+            if fail:
+                config.count(errors=1)
+                self._send_json(config.error_status, {"error": "Injected inference failure"})
+                return
+
+            results = [{"entities": detect(item.get("text", ""), item.get("entities", []))} for item in inputs]
+            self._send_json(200, {"results": results})
+
+    return MockInferenceHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Guardrails inference server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-dist", choices=["const", "uniform", "exp", "lognormal"], default="const")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="base (median/mean) latency per call")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="lognormal shape parameter")
+    parser.add_argument("--per-item-ms", type=float, default=0.0, help="extra latency per batched input")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of calls answered with an error")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="fraction of calls that stall for --hang-ms")
+    parser.add_argument("--hang-ms", type=float, default=30000.0)
+    parser.add_argument("--max-concurrency", type=int, default=0, help="inference slots, 0 for unlimited")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(MockConfig(args)))
+    server.daemon_threads = True
+    print(f"Mock inference server on http://{args.host}:{args.port}/v1/detect "
+          f"({args.latency_dist} {args.latency_ms}ms, errors {args.error_rate:.1%}, hangs {args.hang_rate:.1%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Serve api/python-validate/index.py locally, outside of Vercel.
+
+By default requests are handled one at a time, like a single serverless
+instance. Pass --threaded to handle them concurrently, like a long-lived
+server. Useful as a target for scripts/loadtest.py.
+
+Usage: python scripts/serve_index.py [--port 8001] [--threaded]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from http.server import HTTPServer, ThreadingHTTPServer
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "api", "python-validate", "index.py")
+
+
+def load_handler():
+    spec = importlib.util.spec_from_file_location("python_validate_index", INDEX_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the python-validate function locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--threaded", action="store_true", help="handle requests concurrently")
+    parser.add_argument("--quiet", action="store_true", help="silence request and validator logging")
+    args = parser.parse_args()
+
+    handler = load_handler()
+    if args.quiet:
+        handler.log_message = lambda self, format, *a: None
+
+    server_class = ThreadingHTTPServer if args.threaded else HTTPServer
+    server = server_class((args.host, args.port), handler)
+    server.daemon_threads = True
+    mode = "threaded" if args.threaded else "single instance"
+    print(f"Serving index.py on http://{args.host}:{args.port}/ ({mode})", flush=True)
+    if args.quiet:
+        sys.stdout = open(os.devnull, "w")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()